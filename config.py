@@ -15,20 +15,47 @@ class AppConfig:
     # データベース設定
     DB_NAME = "context_menu.db"
     DB_TIMEOUT = 10.0  # 秒
+    DB_POOL_SIZE = 5  # 接続プールの最大接続数
+    DB_CACHED_STATEMENTS = 256  # 接続ごとにキャッシュするSQL文の数
+    DB_PRAGMAS = (  # 接続作成時に一度だけ適用するPRAGMA
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "temp_store=MEMORY",
+        "mmap_size=268435456",  # 256MB
+        "cache_size=-65536",    # 64MB（上限値。使用した分だけ確保される）
+        "wal_autocheckpoint=1000",  # 1000ページごとにWALをチェックポイントする
+        "foreign_keys=ON",
+    )
+    DB_TEST_PRAGMAS = (  # テスト用の使い捨てDB向け（耐久性を捨ててfsyncを省く）
+        "journal_mode=MEMORY",
+        "synchronous=OFF",
+        "temp_store=MEMORY",
+        "foreign_keys=ON",
+    )
     
     # ウィンドウ設定
     WINDOW_WIDTH = 1000
     WINDOW_HEIGHT = 750
+    REFRESH_DEBOUNCE_MS = 30  # 一覧更新をまとめる待ち時間（ミリ秒）
+    AUDIT_LOG_PAGE_SIZE = 200  # 監査ログ画面で1回に読み込む件数
+    AUDIT_FLUSH_INTERVAL = 1.0  # 監査ログをまとめて書き込む間隔（秒）
+    AUDIT_FLUSH_THRESHOLD = 64  # この件数溜まったら間隔を待たずに書き込む
     
     # 制限値
     MAX_COMMAND_LENGTH = 2000
     MAX_NAME_LENGTH = 100
     MAX_ICON_SIZE_MB = 10
+    MAX_ICON_SIZE_BYTES = MAX_ICON_SIZE_MB * 1024 * 1024
     MAX_IMPORT_COUNT = 1000
+    EXPORT_BUFFER_SIZE = 1 << 20  # エクスポート時の書き込みバッファ（1MB）
     
     # タイムアウト設定
     PROCESS_TIMEOUT = 10  # 秒
-    EXPLORER_RESTART_DELAY = 1.5  # 秒
+    EXPLORER_RESTART_DELAY = 1.5  # 秒（エクスプローラー終了を待つ最大時間）
+    EXPLORER_POLL_INTERVAL = 0.05  # 秒（終了確認の間隔）
+    ASYNC_WATCHDOG_MS = 1000  # 非同期キューの安全確認間隔（ミリ秒、通知漏れ対策のみ）
+    ASYNC_MAX_WORKERS = 4  # 非同期タスクのワーカースレッド数
+    ASYNC_DRAIN_LIMIT = 32  # 1回のキュー処理で扱う最大件数
 
 
 # ✅ チェック完了: config.py
@@ -8,11 +8,47 @@ Version: 2.1.1 (修正版)
 - エラーメッセージの一貫性を改善
 """
 
-import sys
 import winreg
-import json
-from typing import Tuple, Optional, Dict
-from datetime import datetime
+import functools
+import logging
+from typing import Any, Iterator, Tuple, Optional, Dict
+
+
+_log = logging.getLogger(__name__)
+
+# ターゲットタイプごとのレジストリベースパス
+_DEFAULT_BASE_PATH = r'Software\Classes\*\shell'
+_BASE_PATHS: Dict[str, str] = {
+    'all_files': _DEFAULT_BASE_PATH,
+    'folder': r'Software\Classes\Directory\shell',
+    'background': r'Software\Classes\Directory\Background\shell',
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _read_windows_version() -> Tuple[int, int]:
+    """
+    レジストリからWindowsのバージョン情報を取得する
+    
+    プロセス実行中は変化しないため、結果をキャッシュして
+    レジストリへのアクセスを1回に抑える。取得に失敗した場合は例外を送出し、
+    キャッシュされないため次回の呼び出しで再取得する
+    
+    Returns:
+        (メジャーバージョン, ビルド番号)
+    """
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                        r"SOFTWARE\Microsoft\Windows NT\CurrentVersion") as key:
+        # ビルド番号
+        build = int(winreg.QueryValueEx(key, "CurrentBuildNumber")[0])
+    
+    # Windows 11判定 (ビルド22000以上)
+    if build >= 22000:
+        major = 11
+    else:
+        major = 10
+    
+    return major, build
 
 
 class SystemCompatibility:
@@ -21,36 +57,22 @@ class SystemCompatibility:
     @staticmethod
     def get_windows_version() -> Tuple[int, int]:
         """
-        Windowsのバージョン情報を取得する
+        Windowsのバージョン情報を取得する（プロセス内でキャッシュ）
         
         Returns:
             (メジャーバージョン, ビルド番号)
         """
         try:
-            # レジストリからバージョン情報を取得
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                                r"SOFTWARE\Microsoft\Windows NT\CurrentVersion")
-            
-            # ビルド番号
-            build = int(winreg.QueryValueEx(key, "CurrentBuildNumber")[0])
-            
-            # Windows 11判定 (ビルド22000以上)
-            if build >= 22000:
-                major = 11
-            else:
-                major = 10
-            
-            winreg.CloseKey(key)
-            return major, build
-            
+            return _read_windows_version()
         except Exception as e:
-            print(f"警告: バージョン取得エラー: {e}")
+            # 一時的な失敗で既定値が固定されないよう、既定値はキャッシュしない
+            _log.warning("警告: バージョン取得エラー: %s", e)
             return 10, 0
     
     @staticmethod
     def is_win11_compatible() -> bool:
         """
-        Windows 11対応かチェックする
+        Windows 11対応かチェックする（取得に成功したバージョン情報はキャッシュされる）
         
         Returns:
             Windows 11以上の場合True
@@ -83,7 +105,7 @@ class SystemCompatibility:
         except FileNotFoundError:
             return False, None
         except Exception as e:
-            print(f"警告: 競合チェックエラー: {e}")
+            _log.warning("警告: 競合チェックエラー: %s", e)
             return False, None
     
     @staticmethod
@@ -91,52 +113,76 @@ class SystemCompatibility:
         """
         レジストリキーをバックアップする
         
+        値は名前・値・型の並列リスト (names / values / types) で保持する
+        
         Args:
             key_path: レジストリキーパス
             
         Returns:
             バックアップデータ (失敗時はNone)
         """
+        # バックアップ時のみ必要なため遅延インポート
+        from datetime import datetime
+        
         try:
+            timestamp = datetime.now().isoformat()
+            
+            # with文でキーを開き、例外時も確実にクローズする
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
+                # 値の数を先に取得してリストを事前確保する
+                _, value_count, _ = winreg.QueryInfoKey(key)
+                names = [''] * value_count
+                values = [None] * value_count
+                types = [0] * value_count
+                for i in range(value_count):
+                    names[i], values[i], types[i] = winreg.EnumValue(key, i)
+            
             backup_data: Dict = {
                 'path': key_path,
-                'values': {},
-                'timestamp': datetime.now().isoformat()
+                'names': names,
+                'values': values,
+                'types': types,
+                'timestamp': timestamp
             }
-            
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path)
-            
-            # すべての値を取得
-            i = 0
-            while True:
-                try:
-                    name, value, value_type = winreg.EnumValue(key, i)
-                    backup_data['values'][name] = {
-                        'value': value,
-                        'type': value_type
-                    }
-                    i += 1
-                except OSError:
-                    break
-            
-            winreg.CloseKey(key)
             return backup_data
             
         except FileNotFoundError:
             # キーが存在しない場合は空のバックアップ
             return {
                 'path': key_path,
-                'values': {},
+                'names': [],
+                'values': [],
+                'types': [],
                 'timestamp': datetime.now().isoformat()
             }
         except Exception as e:
-            print(f"警告: バックアップエラー: {e}")
+            _log.warning("警告: バックアップエラー: %s", e)
             return None
     
     @staticmethod
+    def iter_backup_values(backup_data: Dict) -> Iterator[Tuple[str, Any, int]]:
+        """
+        バックアップデータの値を (名前, 値, 型) の組で列挙する
+        
+        旧形式（'values' が {名前: {'value': 値, 'type': 型}} の辞書）で保存された
+        バックアップも同じ形で列挙する
+        
+        Args:
+            backup_data: backup_registry_key() の戻り値、または旧形式のバックアップ
+            
+        Returns:
+            (名前, 値, 型) のイテレーター
+        """
+        values = backup_data['values']
+        if isinstance(values, dict):
+            return ((name, item['value'], item['type']) for name, item in values.items())
+        return zip(backup_data['names'], values, backup_data['types'])
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
     def get_registry_base_path(target_type: str) -> str:
         """
-        ターゲットタイプに応じたレジストリベースパスを取得する
+        ターゲットタイプに応じたレジストリベースパスを取得する（プロセス内でキャッシュ）
         
         Args:
             target_type: ターゲットタイプ
@@ -144,17 +190,11 @@ class SystemCompatibility:
         Returns:
             レジストリベースパス
         """
-        base_paths = {
-            'all_files': r'Software\Classes\*\shell',
-            'folder': r'Software\Classes\Directory\shell',
-            'background': r'Software\Classes\Directory\Background\shell',
-        }
-        
         # 拡張子指定の場合
         if target_type.startswith('.'):
             return f'Software\\Classes\\{target_type}\\shell'
         
-        return base_paths.get(target_type, r'Software\Classes\*\shell')
+        return _BASE_PATHS.get(target_type, _DEFAULT_BASE_PATH)
 
 
 # ✅ チェック完了: core/compatibility.py
@@ -6,23 +6,175 @@ Version: 2.1.1 (修正版)
 修正内容:
 - 型ヒントを完全に追加
 - エラーログ機能を改善
+- 接続プールによる接続の再利用
 """
 
+import logging
+import queue
 import sqlite3
-from typing import Optional
+import threading
+from typing import Dict, Optional, Sequence
 from config import AppConfig
 
 
+_log = logging.getLogger(__name__)
+
+
+class SQLiteConnectionPool:
+    """SQLite接続を再利用するためのコネクションプール"""
+    
+    def __init__(self, db_path: str, size: int = AppConfig.DB_POOL_SIZE,
+                 pragmas: Sequence[str] = AppConfig.DB_PRAGMAS) -> None:
+        """
+        Args:
+            db_path: データベースファイルパス
+            size: プールの最大接続数
+            pragmas: 接続作成時に適用するPRAGMA
+        """
+        # :memory: は接続ごとに別DBになるため1接続に制限する
+        if db_path == ':memory:':
+            size = 1
+        
+        self.db_path: str = db_path
+        self.size: int = size
+        self.pragmas: Sequence[str] = pragmas
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self._created: int = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        新しい接続を作成する
+        
+        Returns:
+            データベース接続オブジェクト
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=AppConfig.DB_TIMEOUT,
+            check_same_thread=False,  # プール経由でスレッド間を移動するため
+            isolation_level=None,  # トランザクションは DatabaseManager が明示的に制御する
+            cached_statements=AppConfig.DB_CACHED_STATEMENTS
+        )
+        conn.row_factory = sqlite3.Row  # 辞書形式でアクセス可能にする
+        
+        # 接続ごとに一度だけPRAGMAを適用する
+        conn.executescript("".join(f"PRAGMA {pragma};" for pragma in self.pragmas))
+        return conn
+    
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        プールから接続を取得する（未作成なら遅延作成する）
+        
+        Args:
+            timeout: 空き接続を待つ秒数
+        
+        Returns:
+            データベース接続オブジェクト
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if self._created < self.size:
+                conn = self._connect()
+                self._created += 1
+                return conn
+        
+        try:
+            return self._pool.get(timeout=timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("エラー: 空き接続の取得がタイムアウトしました")
+    
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        接続をプールに返却する
+        
+        Args:
+            conn: 返却する接続
+        """
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    def close_all(self) -> None:
+        """プール内のすべての接続を閉じる"""
+        with self._lock:
+            while True:
+                try:
+                    conn = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+                self._created -= 1
+
+
+# データベースパスごとの接続プール
+_POOLS: Dict[str, SQLiteConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(db_path: str, pragmas: Optional[Sequence[str]] = None) -> SQLiteConnectionPool:
+    """
+    データベースパスに対応する接続プールを取得する
+    
+    Args:
+        db_path: データベースファイルパス
+        pragmas: プールを新規作成する場合に適用するPRAGMA（省略時は AppConfig.DB_PRAGMAS）。
+                 既存のプールには影響しない
+    
+    Returns:
+        接続プール
+    """
+    pool = _POOLS.get(db_path)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(db_path)
+            if pool is None:
+                pool = SQLiteConnectionPool(
+                    db_path, pragmas=AppConfig.DB_PRAGMAS if pragmas is None else pragmas
+                )
+                _POOLS[db_path] = pool
+    return pool
+
+
+def close_pool(db_path: str) -> None:
+    """
+    データベースパスに対応する接続プールを閉じる
+    
+    Args:
+        db_path: データベースファイルパス
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.pop(db_path, None)
+    if pool is not None:
+        pool.close_all()
+
+
 class DatabaseManager:
-    """データベース接続を管理するコンテキストマネージャー"""
+    """
+    データベース接続を管理するコンテキストマネージャー
     
-    def __init__(self, db_path: str) -> None:
+    with ブロック全体が1つのトランザクション (BEGIN IMMEDIATE ... COMMIT) になる。
+    一括書き込みはループ全体を1つの with ブロック内に置くこと。
+    """
+    
+    # DB操作ごとに生成されるため属性辞書を持たせない
+    __slots__ = ('db_path', 'transaction', 'connection', 'pool')
+    
+    def __init__(self, db_path: str, transaction: bool = True) -> None:
         """
         Args:
             db_path: データベースファイルパス
+            transaction: Falseの場合はトランザクションを開始しない（VACUUM・読み取り専用の処理等）
         """
         self.db_path: str = db_path
+        self.transaction: bool = transaction
         self.connection: Optional[sqlite3.Connection] = None
+        self.pool: Optional[SQLiteConnectionPool] = None
     
     def __enter__(self) -> sqlite3.Connection:
         """
@@ -32,15 +184,23 @@ class DatabaseManager:
             データベース接続オブジェクト
         """
         try:
-            self.connection = sqlite3.connect(
-                self.db_path,
-                timeout=AppConfig.DB_TIMEOUT
-            )
-            self.connection.row_factory = sqlite3.Row  # 辞書形式でアクセス可能にする
-            return self.connection
+            self.pool = get_pool(self.db_path)
+            self.connection = self.pool.acquire(timeout=AppConfig.DB_TIMEOUT)
         except sqlite3.Error as e:
-            print(f"エラー: データベース接続失敗: {e}")
+            _log.error("エラー: データベース接続失敗: %s", e)
             raise
+        
+        if self.transaction:
+            try:
+                # 書き込みロックを先に確保し、ブロック内の操作を1回のコミットにまとめる
+                self.connection.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error as e:
+                _log.error("エラー: トランザクション開始失敗: %s", e)
+                self.pool.release(self.connection)
+                self.connection = None
+                raise
+        
+        return self.connection
     
     def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
         """
@@ -54,19 +214,31 @@ class DatabaseManager:
         Returns:
             例外を抑制する場合True
         """
-        if self.connection:
+        conn = self.connection
+        if conn is None:
+            return False
+        self.connection = None
+        
+        if exc_type is None:
+            # 高速パス: 例外がない場合はコミットしてプールへ返却
             try:
-                if exc_type is None:
-                    # 例外がない場合はコミット
-                    self.connection.commit()
-                else:
-                    # 例外がある場合はロールバック
-                    self.connection.rollback()
-                    print(f"警告: トランザクションをロールバックしました: {exc_val}")
+                if conn.in_transaction:
+                    conn.execute("COMMIT")
             except sqlite3.Error as e:
-                print(f"エラー: トランザクション処理失敗: {e}")
-            finally:
-                self.connection.close()
+                _log.error("エラー: トランザクション処理失敗: %s", e)
+                conn.rollback()
+            self.pool.release(conn)
+            return False
+        
+        # 例外がある場合はロールバック
+        try:
+            conn.rollback()
+            _log.warning("警告: トランザクションをロールバックしました: %s", exc_val)
+        except sqlite3.Error as e:
+            _log.error("エラー: トランザクション処理失敗: %s", e)
+        finally:
+            # 接続は閉じずにプールへ返却する
+            self.pool.release(conn)
         
         # 例外は再発生させる
         return False
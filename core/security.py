@@ -10,9 +10,32 @@ Version: 2.1.1 (修正版)
 
 import re
 import os
-from typing import Tuple, Dict, List
+import sys
+from typing import Tuple, Dict, List, Set
 from config import AppConfig
-from utils import SAFE_EXECUTABLES, DANGEROUS_PATTERNS, RESERVED_NAMES, ICON_EXTENSIONS
+from utils import (SAFE_EXECUTABLES, DANGEROUS_PATTERNS_RE, RESERVED_NAMES, ICON_EXTENSIONS,
+                   INVALID_NAME_CHARS, INVALID_NAME_CHARS_RE)
+
+
+# 大文字小文字を区別せずに照合するためのホワイトリスト（casefold 済み）
+# casefold() の結果は新しい文字列になるため、インターンして重複を持たないようにする
+_SAFE_EXES_CF = frozenset(sys.intern(exe.casefold()) for exe in SAFE_EXECUTABLES)
+
+# コマンドの先頭トークン（実行ファイル部分）を取り出す
+# 閉じ引用符の直後が空白か末尾の場合のみ引用符で囲まれたトークンとみなし、
+# それ以外（閉じていない・直後に文字が続く）は空白までを引用符ごと取り出す
+_FIRST_TOKEN_RE = re.compile(r'\s*(?:"([^"]*)"(?=\s|$)|(\S+))')
+
+# 固定の検証結果（呼び出しごとにタプルを生成しない）
+_OK = (True, "OK")
+_ERR_EMPTY_CMD = (False, "エラー: コマンドが空です")
+_ERR_CMD_TOO_LONG = (False, f"エラー: コマンドが長すぎます（最大{AppConfig.MAX_COMMAND_LENGTH}文字）")
+_ERR_NULL = (False, "エラー: NULL文字が含まれています")
+_ERR_DANGEROUS = (False, "エラー: 危険なコマンドパターンが検出されました")
+_ERR_UNC = (False, "エラー: ネットワークパスは使用できません")
+_ERR_EMPTY_NAME = (False, "エラー: 名前が空です")
+_ERR_NAME_TOO_LONG = (False, f"エラー: 名前が長すぎます（最大{AppConfig.MAX_NAME_LENGTH}文字）")
+_ERR_ICON_TOO_LARGE = (False, f"エラー: ファイルサイズが大きすぎます（最大{AppConfig.MAX_ICON_SIZE_MB}MB）")
 
 
 class SecurityValidator:
@@ -31,41 +54,48 @@ class SecurityValidator:
         """
         # 空チェック
         if not command or not command.strip():
-            return False, "エラー: コマンドが空です"
+            return _ERR_EMPTY_CMD
         
         # 長さチェック
         if len(command) > AppConfig.MAX_COMMAND_LENGTH:
-            return False, f"エラー: コマンドが長すぎます（最大{AppConfig.MAX_COMMAND_LENGTH}文字）"
+            return _ERR_CMD_TOO_LONG
         
         # NULL文字の検出
         if '\x00' in command:
-            return False, "エラー: NULL文字が含まれています"
-        
-        # 危険なパターンマッチング
-        for pattern in DANGEROUS_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
-                return False, f"エラー: 危険なコマンドパターンが検出されました"
+            return _ERR_NULL
         
-        # ネットワークパスの検出
+        # ネットワークパスの検出（先頭のみを見る安価な判定を正規表現より先に行う）
         if command.startswith('\\\\'):
-            return False, "エラー: ネットワークパスは使用できません"
+            return _ERR_UNC
+        
+        # 危険なパターンマッチング（走査範囲は最大長までに制限）
+        if DANGEROUS_PATTERNS_RE.search(command, 0, AppConfig.MAX_COMMAND_LENGTH):
+            return _ERR_DANGEROUS
         
         # 実行ファイルのホワイトリストチェック
-        parts = command.split()
-        if parts:
-            exe_name = os.path.basename(parts[0].strip('"')).lower()
+        match = _FIRST_TOKEN_RE.match(command)
+        if match:
+            # 先頭トークンからファイル名部分のみを取り出す
+            exe_path = match.group(1)
+            if exe_path is None:
+                exe_path = match.group(2)
+            # 区切りは \\ と / のみ。':' は先頭のドライブ指定 (C:) の場合だけ取り除く
+            # （途中の ':' で区切ると代替データストリーム名がファイル名として扱われる）
+            sep = max(exe_path.rfind('\\'), exe_path.rfind('/'))
+            if sep < 0 and exe_path[1:2] == ':' and exe_path[:1].isalpha():
+                sep = 1
+            exe_name = exe_path[sep + 1:].casefold()
             
             # ホワイトリストチェック
-            if exe_name and not any(exe_name == safe for safe in SAFE_EXECUTABLES):
+            if exe_name and exe_name not in _SAFE_EXES_CF:
                 # フルパスが指定されている場合は存在確認
-                exe_path = parts[0].strip('"')
                 if os.path.isabs(exe_path):
                     if not os.path.exists(exe_path):
                         return False, f"エラー: 指定された実行ファイルが見つかりません: {exe_path}"
                 else:
                     return False, f"エラー: 実行ファイルがホワイトリストにありません: {exe_name}"
         
-        return True, "OK"
+        return _OK
     
     @staticmethod
     def validate_name(name: str) -> Tuple[bool, str]:
@@ -80,23 +110,26 @@ class SecurityValidator:
         """
         # 空文字チェック
         if not name or not name.strip():
-            return False, "エラー: 名前が空です"
+            return _ERR_EMPTY_NAME
         
         # 長さチェック
         if len(name) > AppConfig.MAX_NAME_LENGTH:
-            return False, f"エラー: 名前が長すぎます（最大{AppConfig.MAX_NAME_LENGTH}文字）"
+            return _ERR_NAME_TOO_LONG
         
         # 使用禁止文字チェック
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            if char in name:
-                return False, f"エラー: 使用できない文字が含まれています: {char}"
+        match = INVALID_NAME_CHARS_RE.search(name)
+        if match:
+            # 報告する文字は従来どおり禁止文字リストの順で決める（制御文字のみの場合はその文字）
+            char = next((c for c in INVALID_NAME_CHARS if c in name), None)
+            if char is None:
+                char = repr(match.group())
+            return False, f"エラー: 使用できない文字が含まれています: {char}"
         
         # 予約語チェック
         if name.upper() in RESERVED_NAMES:
             return False, f"エラー: 予約語は使用できません: {name}"
         
-        return True, "OK"
+        return _OK
     
     @staticmethod
     def validate_icon_path(path: str) -> Tuple[bool, str]:
@@ -111,30 +144,46 @@ class SecurityValidator:
         """
         # 空の場合はOK（省略可能）
         if not path:
-            return True, "OK"
+            return _OK
         
         # ネットワークパスチェック
         if path.startswith('\\\\'):
-            return False, "エラー: ネットワークパスは使用できません"
+            return _ERR_UNC
         
-        # ファイル存在確認
-        if not os.path.exists(path):
-            return False, f"エラー: ファイルが見つかりません: {path}"
-        
-        # 拡張子チェック
+        # 拡張子チェック（文字列のみで判定できるためファイルシステムへの問い合わせより先に行う）
         _, ext = os.path.splitext(path)
         if ext.lower() not in ICON_EXTENSIONS:
             return False, f"エラー: サポートされていないファイル形式です: {ext}"
         
-        # ファイルサイズチェック
+        # ファイル存在確認（サイズも同じstat結果から取得する）
         try:
-            file_size_mb = os.path.getsize(path) / (1024 * 1024)
-            if file_size_mb > AppConfig.MAX_ICON_SIZE_MB:
-                return False, f"エラー: ファイルサイズが大きすぎます（最大{AppConfig.MAX_ICON_SIZE_MB}MB）"
-        except OSError as e:
-            return False, f"エラー: ファイルサイズの取得に失敗しました: {e}"
+            file_stat = os.stat(path)
+        except FileNotFoundError:
+            return False, f"エラー: ファイルが見つかりません: {path}"
+        except (OSError, ValueError) as e:
+            return False, f"エラー: ファイル情報の取得に失敗しました: {e}"
+        
+        # ファイルサイズチェック
+        if file_stat.st_size > AppConfig.MAX_ICON_SIZE_BYTES:
+            return _ERR_ICON_TOO_LARGE
         
-        return True, "OK"
+        return _OK
+    
+    @staticmethod
+    def _is_plain_name(name, max_name: int, search_invalid) -> bool:
+        """
+        validate_name() が確実に成功する名前かを判定する（メッセージは生成しない）
+        
+        Args:
+            name: 判定する名前
+            max_name: 名前の最大長
+            search_invalid: 使用禁止文字の検索関数
+            
+        Returns:
+            確実に有効な名前の場合True（Falseの場合は validate_name() で再判定する）
+        """
+        return (isinstance(name, str) and 0 < len(name) <= max_name and not name.isspace()
+                and search_invalid(name) is None and name.upper() not in RESERVED_NAMES)
     
     @staticmethod
     def sanitize_json_import(data: dict) -> Tuple[bool, str, dict]:
@@ -163,6 +212,19 @@ class SecurityValidator:
         
         sanitized_shortcuts: List[Dict[str, str]] = []
         errors: List[str] = []
+        seen: Set[Tuple[str, str]] = set()
+        # 同じアイコンパスはファイルシステムへの問い合わせを1回にする（このインポート内のみ有効）
+        icon_results: Dict[str, Tuple[bool, str]] = {}
+        append = sanitized_shortcuts.append
+        
+        # 名前の正常判定を一括で行い、疑わしい行だけ validate_name() でメッセージを得る
+        max_name = AppConfig.MAX_NAME_LENGTH
+        search_invalid = INVALID_NAME_CHARS_RE.search
+        names_ok = [
+            isinstance(s, dict) and SecurityValidator._is_plain_name(
+                s.get('name', ''), max_name, search_invalid)
+            for s in shortcuts
+        ]
         
         for i, shortcut in enumerate(shortcuts):
             if not isinstance(shortcut, dict):
@@ -175,10 +237,23 @@ class SecurityValidator:
             target_type = shortcut.get('target_type', '')
             
             # 検証
-            valid_name, msg_name = SecurityValidator.validate_name(name)
-            if not valid_name:
-                errors.append(f"項目{i+1}: {msg_name}")
+            if not names_ok[i]:
+                valid_name, msg_name = SecurityValidator.validate_name(name)
+                if not valid_name:
+                    errors.append(f"項目{i+1}: {msg_name}")
+                    continue
+            
+            if not isinstance(target_type, str):
+                errors.append(f"項目{i+1}: 不正なターゲットタイプ")
+                continue
+            
+            # 重複チェック（名前の検証後に行う）
+            # DBの一意制約 (name, target_type) と同じく名前は完全一致で比較する
+            key = (name, target_type)
+            if key in seen:
+                errors.append(f"項目{i+1}: 重複")
                 continue
+            seen.add(key)
             
             valid_cmd, msg_cmd = SecurityValidator.validate_command(command)
             if not valid_cmd:
@@ -188,12 +263,16 @@ class SecurityValidator:
             # アイコンパス検証（オプション）
             icon_path = shortcut.get('icon_path', '')
             if icon_path:
-                valid_icon, msg_icon = SecurityValidator.validate_icon_path(icon_path)
+                icon_result = icon_results.get(icon_path)
+                if icon_result is None:
+                    icon_result = SecurityValidator.validate_icon_path(icon_path)
+                    icon_results[icon_path] = icon_result
+                valid_icon, msg_icon = icon_result
                 if not valid_icon:
                     errors.append(f"項目{i+1}: {msg_icon}")
                     icon_path = ''  # エラー時は空にする
             
-            sanitized_shortcuts.append({
+            append({
                 'name': name,
                 'command': command,
                 'target_type': target_type,
@@ -11,16 +11,23 @@ Version: 2.1.1 (修正版)
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import Optional, Any
+from operator import attrgetter
+from typing import Optional, Any, Callable, Dict, List, Tuple
 from config import AppConfig
-from models.database import ContextMenuDatabase
+from models.database import ContextMenuDatabase, Shortcut
 from managers.menu import ContextMenuManager
 from managers.async_task import AsyncTaskManager
 from core.compatibility import SystemCompatibility
+from core.database import DatabaseManager
 from core.security import SecurityValidator  # 🔴 修正3: __init__でインポート
 from utils import TARGET_TYPES
 
 
+# 一覧表示に使う列を行からまとめて取り出す（Cレベルで一括取得）
+_ROW_FIELDS = attrgetter('id', 'name', 'command_short', 'target_type',
+                         'is_active', 'is_system_applied')
+
+
 class ContextMenuGUI:
     """メインGUIアプリケーションクラス"""
     
@@ -38,8 +45,19 @@ class ContextMenuGUI:
         # データベースとマネージャー初期化
         self.db = ContextMenuDatabase(AppConfig.DB_NAME)
         self.menu_manager = ContextMenuManager()
-        self.async_manager = AsyncTaskManager(self.async_callback)
+        self.async_manager = AsyncTaskManager(
+            self.async_callback,
+            wake=lambda: self.root.after(0, self.check_async_queue)
+        )
         self.validator = SecurityValidator()  # 🔴 修正3: 初期化時に作成
+        # プロセス実行中は変化しないため起動時に1回だけ取得する
+        self._win_ver: Tuple[int, int] = SystemCompatibility.get_windows_version()
+        
+        # 非同期タスクのタグ -> 完了ハンドラー
+        self._handlers: Dict[str, Callable[[str, Any], None]] = {
+            'restart': self._on_restart_done,
+            'vacuum': self._on_vacuum_done,
+        }
         
         # UI変数
         self.name_var = tk.StringVar()
@@ -47,14 +65,22 @@ class ContextMenuGUI:
         self.target_var = tk.StringVar(value=TARGET_TYPES[0])
         self.icon_var = tk.StringVar()
         
+        # 一覧に表示中の行データ（ショートカットID -> 表示値、差分更新に使用）
+        self._row_cache: Dict[int, tuple] = {}
+        # 一覧表示中のショートカット行（ID -> Shortcut）
+        self._rows: Dict[int, Shortcut] = {}
+        self._refresh_pending: bool = False
+        # 一覧更新後に表示する通知（タイトル, メッセージ）
+        self._pending_notices: List[Tuple[str, str]] = []
+        
         # UI作成
         self.create_menu()
         self.create_widgets()
         self.update_style_status()
         self.refresh_shortcut_list()
         
-        # 定期的なキューチェック
-        self.root.after(100, self.check_async_queue)
+        # 通知漏れに備えた低頻度の安全策（通常はワーカーからの通知で処理）
+        self.root.after(AppConfig.ASYNC_WATCHDOG_MS, self._watch_async_queue)
     
     def create_menu(self) -> None:
         """メニューバーを作成する"""
@@ -246,38 +272,86 @@ class ContextMenuGUI:
         result = self.db.add_shortcut(name, command, target_type, icon_path)
         
         if result:
-            messagebox.showinfo("成功", f"ショートカット '{name}' を追加しました")
             self.name_var.set("")
             self.command_var.set("")
             self.icon_var.set("")
-            self.refresh_shortcut_list()
+            self._refresh_then_notify("成功", f"ショートカット '{name}' を追加しました")
         else:
             messagebox.showerror("エラー", "ショートカットの追加に失敗しました")
     
     def refresh_shortcut_list(self) -> None:
         """ショートカット一覧を更新する"""
-        # 既存項目をクリア
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # データベースから取得
-        shortcuts = self.db.get_all_shortcuts()
+        # データベースから取得（コマンドの切り詰めはSQL側で実施済み）
+        shortcuts = self.db.get_all_shortcuts_for_display()
         
+        # 表示用の行データを先にまとめて作成
+        rows = []
+        rows_append = rows.append
         for s in shortcuts:
-            status = "有効" if s['is_active'] else "無効"
-            applied = "適用済み" if s['is_system_applied'] else "未適用"
-            
-            self.tree.insert('', tk.END, values=(
-                s['id'],
-                s['name'],
-                s['command'][:50] + '...' if len(s['command']) > 50 else s['command'],
-                s['target_type'],
-                status,
-                applied
+            shortcut_id, name, command_short, target_type, active, applied = _ROW_FIELDS(s)
+            rows_append((
+                shortcut_id,
+                name,
+                command_short,
+                target_type,
+                "有効" if active else "無効",
+                "適用済み" if applied else "未適用"
             ))
         
+        # 選択操作で再取得しないよう、表示中の行をIDで保持する
+        self._rows = {s.id: s for s in shortcuts}
+        
+        # 差分更新: 削除された行だけ削除し、新規行の挿入・変更行の更新のみ行う
+        new_rows = {values[0]: values for values in rows}
+        
+        # ループ内の属性参照を避けるためローカル変数に束縛する
+        row_cache = self._row_cache
+        cache_get = row_cache.get
+        tree_insert = self.tree.insert
+        tree_item = self.tree.item
+        
+        for old_id in row_cache.keys() - new_rows.keys():
+            self.tree.delete(str(old_id))
+            del row_cache[old_id]
+        
+        for index, (shortcut_id, values) in enumerate(new_rows.items()):
+            cached = cache_get(shortcut_id)
+            if cached is None:
+                tree_insert('', index, iid=str(shortcut_id), values=values)
+            elif cached != values:
+                tree_item(str(shortcut_id), values=values)
+            row_cache[shortcut_id] = values
+        
         self.status_label.config(text=f"ショートカット数: {len(shortcuts)}")
     
+    def _schedule_refresh(self) -> None:
+        """一覧の更新を予約する（連続した更新要求を1回にまとめる）"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.root.after(AppConfig.REFRESH_DEBOUNCE_MS, self._do_refresh)
+    
+    def _do_refresh(self) -> None:
+        """予約された一覧の更新を実行する"""
+        self._refresh_pending = False
+        self.refresh_shortcut_list()
+        
+        # 更新完了後、アイドル時に通知ダイアログを表示する
+        # （ダイアログ内部のイベント処理が一覧更新に割り込まないようにする）
+        notices, self._pending_notices = self._pending_notices, []
+        for title, message in notices:
+            self.root.after_idle(messagebox.showinfo, title, message)
+    
+    def _refresh_then_notify(self, title: str, message: str) -> None:
+        """
+        一覧の更新を予約し、更新後に情報ダイアログを表示する
+        
+        Args:
+            title: ダイアログのタイトル
+            message: 表示するメッセージ
+        """
+        self._pending_notices.append((title, message))
+        self._schedule_refresh()
+    
     def apply_selected(self) -> None:
         """選択されたショートカットをシステムに適用する"""
         selection = self.tree.selection()
@@ -285,12 +359,9 @@ class ContextMenuGUI:
             messagebox.showwarning("選択エラー", "ショートカットを選択してください")
             return
         
-        item = self.tree.item(selection[0])
-        shortcut_id = item['values'][0]
-        
-        # データベースから詳細取得
-        shortcuts = self.db.get_all_shortcuts()
-        shortcut = next((s for s in shortcuts if s['id'] == shortcut_id), None)
+        # 行のiidはショートカットID（一覧更新時に保持した行から取得）
+        shortcut_id = int(selection[0])
+        shortcut = self._rows.get(shortcut_id)
         
         if not shortcut:
             messagebox.showerror("エラー", "ショートカット情報が見つかりません")
@@ -298,17 +369,16 @@ class ContextMenuGUI:
         
         # 適用
         success, message = self.menu_manager.apply_shortcut(
-            name=shortcut['name'],
-            command=shortcut['command'],
-            target_type=shortcut['target_type'],
-            icon_path=shortcut['icon_path'],
+            name=shortcut.name,
+            command=shortcut.command,
+            target_type=shortcut.target_type,
+            icon_path=shortcut.icon_path,
             db=self.db
         )
         
         if success:
             self.db.update_system_applied(shortcut_id, True)
-            messagebox.showinfo("成功", message)
-            self.refresh_shortcut_list()
+            self._refresh_then_notify("成功", message)
         else:
             messagebox.showerror("エラー", message)
     
@@ -319,16 +389,18 @@ class ContextMenuGUI:
             messagebox.showwarning("選択エラー", "ショートカットを選択してください")
             return
         
-        item = self.tree.item(selection[0])
-        shortcut_id = item['values'][0]
-        name = item['values'][1]
+        shortcut_id = int(selection[0])
+        shortcut = self._rows.get(shortcut_id)
+        if not shortcut:
+            messagebox.showerror("エラー", "ショートカット情報が見つかりません")
+            return
+        name = shortcut.name
         
         if not messagebox.askyesno("確認", f"ショートカット '{name}' を削除しますか?"):
             return
         
         if self.db.delete_shortcut(shortcut_id):
-            messagebox.showinfo("成功", "ショートカットを削除しました")
-            self.refresh_shortcut_list()
+            self._refresh_then_notify("成功", "ショートカットを削除しました")
         else:
             messagebox.showerror("エラー", "削除に失敗しました")
     
@@ -343,7 +415,7 @@ class ContextMenuGUI:
         shortcut_id = item['values'][0]
         
         if self.db.toggle_active(shortcut_id):
-            self.refresh_shortcut_list()
+            self._schedule_refresh()
     
     def switch_to_win10(self) -> None:
         """Windows 10スタイルに切り替える"""
@@ -374,7 +446,7 @@ class ContextMenuGUI:
         try:
             self.progress.start()
             self.status_label.config(text="エクスプローラーを再起動中...")
-            self.async_manager.run_async(self.menu_manager.restart_explorer)
+            self.async_manager.run_async('restart', self.menu_manager.restart_explorer)
         except Exception as e:
             # エラー時もプログレスバーを確実に停止
             self.progress.stop()
@@ -404,18 +476,17 @@ class ContextMenuGUI:
         )
         
         if filename:
-            success, skip, errors = self.db.import_from_json(filename)
+            success, skip, errors = self.db.import_from_json(filename, bulk=True)
             
             message = f"成功: {success}件\nスキップ: {skip}件"
             if errors:
                 message += f"\nエラー: {len(errors)}件\n" + "\n".join(errors[:3])
             
-            messagebox.showinfo("インポート結果", message)
-            self.refresh_shortcut_list()
+            self._refresh_then_notify("インポート結果", message)
     
     def show_system_info(self) -> None:
         """システム情報ダイアログを表示する"""
-        major, build = SystemCompatibility.get_windows_version()
+        major, build = self._win_ver
         
         info = f"""
 システム情報
@@ -450,30 +521,67 @@ Windows バージョン: {major}
         
         # スクロールバー
         scrollbar = ttk.Scrollbar(log_window, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
         
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # ログ取得
-        logs = self.db.get_audit_log()
-        for log in logs:
-            tree.insert('', tk.END, values=(
-                log['timestamp'],
-                log['action'],
-                log.get('shortcut_name', ''),
-                log.get('details', '')
-            ))
+        # ログは1ページずつ取得し、末尾付近までスクロールしたら次のページを追加する
+        page_size = AppConfig.AUDIT_LOG_PAGE_SIZE
+        state = {'offset': 0, 'exhausted': False}
+        
+        def load_more() -> None:
+            if state['exhausted']:
+                return
+            logs = self.db.get_audit_log(limit=page_size, offset=state['offset'])
+            state['offset'] += len(logs)
+            if len(logs) < page_size:
+                state['exhausted'] = True
+            tree_insert = tree.insert
+            end = tk.END
+            for log in logs:
+                tree_insert('', end, values=(
+                    log.timestamp,
+                    log.action,
+                    log.shortcut_name,
+                    log.details
+                ))
+        
+        def on_scroll(first: str, last: str) -> None:
+            scrollbar.set(first, last)
+            if float(last) > 0.9 and not state['exhausted']:
+                # スクロール通知の処理中に挿入しないようアイドル時に読み込む
+                log_window.after_idle(load_more)
+        
+        tree.configure(yscrollcommand=on_scroll)
+        load_more()
     
     def optimize_database(self) -> None:
-        """データベースを最適化する（VACUUM実行）"""
+        """データベースを最適化する（VACUUMをバックグラウンドで実行）"""
         try:
-            from core.database import DatabaseManager
-            with DatabaseManager(self.db.db_path) as conn:
+            self.progress.start()
+            self.status_label.config(text="最適化中...")
+            self.async_manager.run_async('vacuum', self._do_vacuum)
+        except Exception as e:
+            # エラー時もプログレスバーを確実に停止
+            self.progress.stop()
+            self.status_label.config(text="準備完了")
+            messagebox.showerror("エラー", f"処理開始エラー: {e}")
+    
+    def _do_vacuum(self) -> Tuple[bool, str]:
+        """
+        VACUUMを実行する（ワーカースレッドで呼ばれる）
+        
+        Returns:
+            (成功, メッセージ)
+        """
+        try:
+            # ワーカー専用の接続をプールから取得する
+            # VACUUMはトランザクション内で実行できない
+            with DatabaseManager(self.db.db_path, transaction=False) as conn:
                 conn.execute('VACUUM')
-            messagebox.showinfo("成功", "データベースを最適化しました")
+            return True, "データベースを最適化しました"
         except Exception as e:
-            messagebox.showerror("エラー", f"最適化失敗: {e}")
+            return False, f"最適化失敗: {e}"
     
     def show_help(self) -> None:
         """使い方ヘルプダイアログを表示する"""
@@ -540,27 +648,59 @@ Windowsの右クリックメニューを
         
         messagebox.showinfo("バージョン情報", about_text.strip())
     
-    def async_callback(self, status: str, result: Any) -> None:
-        """非同期タスクのコールバック"""
-        # 🟡 修正4: プログレスバーを確実に停止
-        self.progress.stop()
-        
-        if status == 'success':
-            success, message = result
-            if success:
-                messagebox.showinfo("成功", message)
-                self.update_style_status()
+    def async_callback(self, tag: str, status: str, result: Any) -> None:
+        """
+        非同期タスクのコールバック（タグに応じたハンドラーへ振り分ける）
+        
+        Args:
+            tag: タスクの種類
+            status: 'success' または 'error'
+            result: タスクの戻り値（エラー時はメッセージ）
+        """
+        try:
+            handler = self._handlers.get(tag)
+            if handler is None:
+                print(f"警告: 未知の非同期タスク: {tag}")
             else:
-                messagebox.showerror("エラー", message)
+                handler(status, result)
+        finally:
+            # 🟡 修正4: どのタスクでもプログレスバーを確実に停止
+            self.progress.stop()
+            self.status_label.config(text="準備完了")
+    
+    def _on_restart_done(self, status: str, result: Any) -> None:
+        """エクスプローラー再起動の完了処理"""
+        if status != 'success':
+            messagebox.showerror("エラー", f"処理エラー: {result}")
+            return
+        
+        success, message = result
+        if success:
+            messagebox.showinfo("成功", message)
+            self.update_style_status()
         else:
+            messagebox.showerror("エラー", message)
+    
+    def _on_vacuum_done(self, status: str, result: Any) -> None:
+        """データベース最適化の完了処理"""
+        if status != 'success':
             messagebox.showerror("エラー", f"処理エラー: {result}")
+            return
         
-        self.status_label.config(text="準備完了")
+        success, message = result
+        if success:
+            messagebox.showinfo("成功", message)
+        else:
+            messagebox.showerror("エラー", message)
     
     def check_async_queue(self) -> None:
-        """非同期タスクキューを定期チェック"""
+        """非同期タスクキューを処理する（ワーカーからの通知で呼ばれる）"""
         self.async_manager.check_queue()
-        self.root.after(100, self.check_async_queue)
+    
+    def _watch_async_queue(self) -> None:
+        """通知漏れに備えてキューを低頻度で確認する"""
+        self.check_async_queue()
+        self.root.after(AppConfig.ASYNC_WATCHDOG_MS, self._watch_async_queue)
 
 
 # ✅ チェック完了: gui/main.py
@@ -56,6 +56,12 @@ def main() -> NoReturn:
         app = ContextMenuGUI(root)
         root.mainloop()
         
+        # 未着手の非同期タスクを破棄してワーカーを停止する
+        app.async_manager.stop()
+        
+        # 未書き込みの監査ログを保存してデータベース接続を閉じる
+        app.db.close()
+        
     except ImportError as e:
         messagebox.showerror(
             "インポートエラー",
@@ -8,28 +8,38 @@ Version: 2.1.1 (修正版)
 - エラーハンドリングを改善
 """
 
-import threading
 import queue
-from typing import Callable, Any, Tuple
+import threading
+from typing import Callable, Any, List, Optional, Tuple
+from config import AppConfig
 
 
 class AsyncTaskManager:
     """非同期タスクを管理するクラス"""
     
-    def __init__(self, callback: Callable[[str, Any], None]) -> None:
+    def __init__(self, callback: Callable[[str, str, Any], None],
+                 wake: Optional[Callable[[], None]] = None) -> None:
         """
         Args:
-            callback: タスク完了時のコールバック関数
+            callback: タスク完了時のコールバック関数 (タグ, ステータス, 結果)
+            wake: 結果投入後にメインスレッドへキュー処理を依頼する関数
+                  （例: lambda: root.after(0, check_queue)）
         """
-        self.callback: Callable[[str, Any], None] = callback
-        self.queue: queue.Queue[Tuple[str, Any]] = queue.Queue()
+        self.callback: Callable[[str, str, Any], None] = callback
+        self.wake: Optional[Callable[[], None]] = wake
+        self.queue: queue.Queue[Tuple[str, str, Any]] = queue.Queue()
         self.running: bool = True
+        # タスクごとにスレッドを生成せず、固定数のワーカーを再利用する
+        # （デーモンスレッドのため、応答しないタスクがあってもウィンドウ終了後にプロセスが残らない）
+        self._tasks: queue.Queue = queue.Queue()
+        self._workers: List[threading.Thread] = []
     
-    def run_async(self, func: Callable, *args: Any, **kwargs: Any) -> None:
+    def run_async(self, tag: str, func: Callable, *args: Any, **kwargs: Any) -> None:
         """
         関数を非同期で実行する
         
         Args:
+            tag: タスクの種類（コールバックで結果の処理方法を選ぶために使用）
             func: 実行する関数
             *args: 位置引数
             **kwargs: キーワード引数
@@ -37,28 +47,75 @@ class AsyncTaskManager:
         def worker() -> None:
             try:
                 result = func(*args, **kwargs)
-                self.queue.put(('success', result))
+                self.queue.put((tag, 'success', result))
             except Exception as e:
-                self.queue.put(('error', str(e)))
+                self.queue.put((tag, 'error', str(e)))
+            
+            # ポーリングを待たずにメインスレッドを起こす
+            if self.wake:
+                try:
+                    self.wake()
+                except Exception as e:
+                    print(f"警告: キュー通知エラー: {e}")
         
-        thread = threading.Thread(target=worker, daemon=True)
-        thread.start()
+        self._tasks.put(worker)
+        
+        # 上限に達するまでは投入ごとにワーカーを追加する
+        if len(self._workers) < AppConfig.ASYNC_MAX_WORKERS:
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"AsyncTask_{len(self._workers)}",
+                daemon=True
+            )
+            self._workers.append(thread)
+            thread.start()
+    
+    def _worker_loop(self) -> None:
+        """タスクキューから取り出したタスクを順に実行する（ワーカースレッド）"""
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            task()
     
     def check_queue(self) -> None:
-        """キューをチェックしてコールバックを呼び出す"""
+        """
+        キューをチェックしてコールバックを呼び出す
+        
+        1回の呼び出しで処理する件数は ASYNC_DRAIN_LIMIT 件までとし、
+        残りがあれば wake で次回の処理を依頼してメインループを占有しない
+        """
         try:
-            while not self.queue.empty():
-                status, result = self.queue.get_nowait()
+            for _ in range(AppConfig.ASYNC_DRAIN_LIMIT):
+                try:
+                    tag, status, result = self.queue.get_nowait()
+                except queue.Empty:
+                    return
                 if self.callback:
-                    self.callback(status, result)
-        except queue.Empty:
-            pass
+                    self.callback(tag, status, result)
         except Exception as e:
             print(f"警告: キューチェックエラー: {e}")
+            return
+        
+        # 上限に達した場合は残りを次回に回す
+        if self.wake and not self.queue.empty():
+            try:
+                self.wake()
+            except Exception as e:
+                print(f"警告: キュー通知エラー: {e}")
     
     def stop(self) -> None:
         """タスクマネージャーを停止する"""
         self.running = False
+        
+        # 未着手のタスクは破棄し、各ワーカーに終了を通知する（実行中のタスクは待たない）
+        try:
+            while True:
+                self._tasks.get_nowait()
+        except queue.Empty:
+            pass
+        for _ in self._workers:
+            self._tasks.put(None)
 
 
 # ✅ チェック完了: managers/async_task.py
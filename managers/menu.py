@@ -11,12 +11,93 @@ Version: 2.1.1 (修正版)
 import winreg
 import subprocess
 import time
+import ctypes
+from ctypes import wintypes
 from typing import Tuple, Optional
 from config import AppConfig
 from core.compatibility import SystemCompatibility
 from core.security import SecurityValidator
 
 
+# Windows 10 スタイルのメニューを有効にするCLSIDキー（存在すれば旧スタイル）
+_WIN10_STYLE_CLSID = r"Software\Classes\CLSID\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}"
+_WIN10_STYLE_KEY = _WIN10_STYLE_CLSID + r"\InprocServer32"
+
+# Win32エラーコード
+_ERROR_SUCCESS = 0
+_ERROR_FILE_NOT_FOUND = 2
+_ERROR_ACCESS_DENIED = 5
+
+# サブキーを含むキーツリーを1回のAPI呼び出しで削除する (advapi32!RegDeleteTreeW)
+_RegDeleteTree = ctypes.windll.advapi32.RegDeleteTreeW
+_RegDeleteTree.argtypes = [wintypes.HKEY, wintypes.LPCWSTR]
+_RegDeleteTree.restype = wintypes.LONG
+
+# プロセス列挙用のAPI (Toolhelp32)
+_TH32CS_SNAPPROCESS = 0x00000002
+_INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+_CloseHandle = ctypes.windll.kernel32.CloseHandle
+_CloseHandle.argtypes = [wintypes.HANDLE]
+_CloseHandle.restype = wintypes.BOOL
+
+
+class _PROCESSENTRY32W(ctypes.Structure):
+    """Toolhelp32 のプロセス情報構造体"""
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * wintypes.MAX_PATH),
+    ]
+
+
+_CreateToolhelp32Snapshot = ctypes.windll.kernel32.CreateToolhelp32Snapshot
+_CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+_CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+
+_Process32First = ctypes.windll.kernel32.Process32FirstW
+_Process32First.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+_Process32First.restype = wintypes.BOOL
+
+_Process32Next = ctypes.windll.kernel32.Process32NextW
+_Process32Next.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+_Process32Next.restype = wintypes.BOOL
+
+
+def _is_process_running(exe_name: str) -> bool:
+    """
+    指定した実行ファイル名のプロセスが動作中か確認する
+    
+    Args:
+        exe_name: 実行ファイル名（小文字、例: "explorer.exe"）
+        
+    Returns:
+        動作中の場合True（確認できない場合はFalse）
+    """
+    snapshot = _CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+    if snapshot == _INVALID_HANDLE_VALUE:
+        return False
+    
+    try:
+        entry = _PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(entry)
+        found = _Process32First(snapshot, ctypes.byref(entry))
+        while found:
+            if entry.szExeFile.lower() == exe_name:
+                return True
+            found = _Process32Next(snapshot, ctypes.byref(entry))
+        return False
+    finally:
+        _CloseHandle(snapshot)
+
+
 class ContextMenuManager:
     """Windowsレジストリを操作してコンテキストメニューを管理するクラス"""
     
@@ -24,25 +105,33 @@ class ContextMenuManager:
         """ContextMenuManagerを初期化する"""
         self.compatibility = SystemCompatibility()
         self.validator = SecurityValidator()
+        # スタイル切り替え時のみ変化するため取得結果を保持する
+        self._style_cache: Optional[str] = None
     
     def get_current_style(self) -> str:
         """
-        現在のメニュースタイルを取得する
+        現在のメニュースタイルを取得する（切り替えるまでキャッシュ）
         
         Returns:
             "Windows 10 スタイル" または "Windows 11 スタイル"
         """
+        if self._style_cache is not None:
+            return self._style_cache
+        
         try:
             key = winreg.OpenKey(
                 winreg.HKEY_CURRENT_USER,
-                r"Software\Classes\CLSID\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}\InprocServer32"
+                _WIN10_STYLE_KEY
             )
             winreg.CloseKey(key)
-            return "Windows 10 スタイル"
+            self._style_cache = "Windows 10 スタイル"
         except FileNotFoundError:
-            return "Windows 11 スタイル"
+            self._style_cache = "Windows 11 スタイル"
         except Exception:
+            # 判定できない場合はキャッシュせず次回再取得する
             return "不明"
+        
+        return self._style_cache
     
     def switch_to_win10_style(self) -> Tuple[bool, str]:
         """
@@ -58,10 +147,11 @@ class ContextMenuManager:
             # レジストリキーを作成
             key = winreg.CreateKeyEx(
                 winreg.HKEY_CURRENT_USER,
-                r"Software\Classes\CLSID\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}\InprocServer32"
+                _WIN10_STYLE_KEY
             )
             winreg.SetValueEx(key, "", 0, winreg.REG_SZ, "")
             winreg.CloseKey(key)
+            self._style_cache = None
             
             return True, "Windows 10スタイルに変更しました。エクスプローラーを再起動してください。"
             
@@ -82,8 +172,9 @@ class ContextMenuManager:
             # レジストリキーを削除
             winreg.DeleteKey(
                 winreg.HKEY_CURRENT_USER,
-                r"Software\Classes\CLSID\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}\InprocServer32"
+                _WIN10_STYLE_KEY
             )
+            self._style_cache = None
             
             return True, "Windows 11スタイルに変更しました。エクスプローラーを再起動してください。"
             
@@ -113,8 +204,10 @@ class ContextMenuManager:
                 capture_output=True
             )
             
-            # 待機
-            time.sleep(AppConfig.EXPLORER_RESTART_DELAY)
+            # 終了を確認できた時点ですぐに起動する（最大 EXPLORER_RESTART_DELAY 秒待機）
+            deadline = time.monotonic() + AppConfig.EXPLORER_RESTART_DELAY
+            while _is_process_running('explorer.exe') and time.monotonic() < deadline:
+                time.sleep(AppConfig.EXPLORER_POLL_INTERVAL)
             
             # エクスプローラーを起動
             subprocess.Popen('explorer.exe')
@@ -131,6 +224,9 @@ class ContextMenuManager:
         """
         レジストリキーを再帰的に削除する（内部メソッド）
         
+        RegDeleteTreeW でツリー全体をまとめて削除し、アクセス拒否の場合のみ
+        Pythonでの列挙による削除にフォールバックする
+        
         Args:
             hkey: レジストリハイブ
             key_path: キーパス
@@ -138,33 +234,55 @@ class ContextMenuManager:
         Returns:
             成功時True
         """
-        try:
-            # サブキーを列挙して削除
-            key = winreg.OpenKey(hkey, key_path, 0, winreg.KEY_ALL_ACCESS)
+        result = _RegDeleteTree(hkey, key_path)
+        
+        # キーが存在しない場合は成功とみなす
+        if result in (_ERROR_SUCCESS, _ERROR_FILE_NOT_FOUND):
+            return True
+        
+        if result == _ERROR_ACCESS_DENIED:
+            return self._delete_registry_key_walk(hkey, key_path)
+        
+        print(f"警告: レジストリキー削除エラー: {key_path} - {ctypes.FormatError(result)}")
+        return False
+    
+    def _delete_registry_key_walk(self, hkey, key_path: str) -> bool:
+        """
+        サブキーを列挙してレジストリキーを削除する（内部メソッド）
+        
+        再帰せずに作業リストで子孫キーをすべて列挙し、深い順に削除する
+        
+        Args:
+            hkey: レジストリハイブ
+            key_path: キーパス
             
-            subkeys = []
-            i = 0
-            while True:
+        Returns:
+            成功時True
+        """
+        try:
+            # 子孫キーを列挙（親は子より先に order に入る）
+            stack = [key_path]
+            order = []
+            while stack:
+                path = stack.pop()
                 try:
-                    subkey = winreg.EnumKey(key, i)
-                    subkeys.append(subkey)
-                    i += 1
-                except OSError:
-                    break
-            
-            winreg.CloseKey(key)
-            
-            # 再帰的にサブキーを削除
-            for subkey in subkeys:
-                self._delete_registry_key_recursive(hkey, f"{key_path}\\{subkey}")
+                    # 列挙に必要な最小限の権限で開く（削除権限は DeleteKey 時に確認される）
+                    with winreg.OpenKey(hkey, path, 0, winreg.KEY_ENUMERATE_SUB_KEYS | winreg.KEY_QUERY_VALUE) as key:
+                        sub_key_count, _, _ = winreg.QueryInfoKey(key)
+                        for i in range(sub_key_count):
+                            stack.append(f"{path}\\{winreg.EnumKey(key, i)}")
+                except FileNotFoundError:
+                    continue
+                order.append(path)
             
-            # 最後にキー自体を削除
-            winreg.DeleteKey(hkey, key_path)
+            # 子から順に削除
+            for path in reversed(order):
+                try:
+                    winreg.DeleteKey(hkey, path)
+                except FileNotFoundError:
+                    pass
             return True
             
-        except FileNotFoundError:
-            # キーが存在しない場合は成功とみなす
-            return True
         except Exception as e:
             print(f"警告: レジストリキー削除エラー: {key_path} - {e}")
             return False
@@ -214,32 +332,25 @@ class ContextMenuManager:
                 if backup_data:
                     db.save_registry_backup(name, backup_data)
             
-            # メニューキー作成
-            menu_key = winreg.CreateKeyEx(
-                winreg.HKEY_CURRENT_USER,
-                menu_key_path
-            )
-            
-            # アイコン設定
-            if icon_path:
-                winreg.SetValueEx(menu_key, "Icon", 0, winreg.REG_SZ, icon_path)
-            
-            winreg.CloseKey(menu_key)
-            
-            # コマンドキー作成
-            command_key_path = f"{menu_key_path}\\command"
-            command_key = winreg.CreateKeyEx(
-                winreg.HKEY_CURRENT_USER,
-                command_key_path
-            )
+        except Exception as e:
+            return False, f"エラー: 適用失敗: {e}"
+        
+        try:
+            # メニューキー作成・アイコン設定
+            with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, menu_key_path) as menu_key:
+                if icon_path:
+                    winreg.SetValueEx(menu_key, "Icon", 0, winreg.REG_SZ, icon_path)
             
-            # コマンド設定
-            winreg.SetValueEx(command_key, "", 0, winreg.REG_SZ, command)
-            winreg.CloseKey(command_key)
+            # コマンドキー作成・コマンド設定
+            with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER,
+                                    f"{menu_key_path}\\command") as command_key:
+                winreg.SetValueEx(command_key, "", 0, winreg.REG_SZ, command)
             
             return True, f"ショートカット '{name}' を適用しました"
             
         except Exception as e:
+            # 途中まで作成したキーを残さないよう削除する
+            self.remove_shortcut(name, target_type)
             return False, f"エラー: 適用失敗: {e}"
     
     def remove_shortcut(self, name: str, target_type: str) -> Tuple[bool, str]:
@@ -257,11 +368,23 @@ class ContextMenuManager:
             base_path = self.compatibility.get_registry_base_path(target_type)
             menu_key_path = f"{base_path}\\{name}"
             
-            # 🔴 修正2: 再帰的削除を使用
-            success = self._delete_registry_key_recursive(
-                winreg.HKEY_CURRENT_USER,
-                menu_key_path
-            )
+            # 既知の構造（メニューキーと command サブキー）は列挙せずに直接削除する
+            try:
+                try:
+                    winreg.DeleteKey(winreg.HKEY_CURRENT_USER, f"{menu_key_path}\\command")
+                except FileNotFoundError:
+                    pass
+                winreg.DeleteKey(winreg.HKEY_CURRENT_USER, menu_key_path)
+                success = True
+            except FileNotFoundError:
+                # キーが存在しない場合は成功とみなす
+                success = True
+            except OSError:
+                # 🔴 修正2: 想定外のサブキーがある場合などは再帰的削除を使用
+                success = self._delete_registry_key_recursive(
+                    winreg.HKEY_CURRENT_USER,
+                    menu_key_path
+                )
             
             if success:
                 return True, f"ショートカット '{name}' を削除しました"
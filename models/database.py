@@ -9,16 +9,116 @@ Version: 2.1.1 (修正版)
 - 型ヒントを完全に追加
 """
 
+import functools
 import json
-from typing import Optional, List, Dict, Tuple, Set
+import os
+import stat
+import tempfile
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager, suppress
+from typing import Deque, Iterator, Optional, List, Dict, Tuple, Set
 from datetime import datetime
-from core.database import DatabaseManager
+from config import AppConfig
+from core.database import DatabaseManager, close_pool
 from core.security import SecurityValidator
 
+try:
+    # orjson がインストールされていればJSONの読み込みに使用する（任意依存）
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# ショートカットの1行（command_short は表示用取得時のみ設定される）
+Shortcut = namedtuple(
+    'Shortcut',
+    'id name command target_type icon_path is_active is_system_applied '
+    'apply_count created_at command_short',
+    defaults=('',)
+)
+
+# 監査ログの1行（NULLの列は空文字に置き換えて返す）
+AuditRow = namedtuple('AuditRow', 'id action shortcut_name details timestamp',
+                      defaults=('', '', ''))
+
 
 class ContextMenuDatabase:
     """ショートカット情報をSQLiteデータベースで管理するクラス"""
     
+    # 一括追加で1文に含める行数（4列 × 125行 = 500 バインド変数。上限 999 に余裕を持たせる）
+    _BULK_INSERT_ROWS = 125
+    
+    # 頻繁に実行するSQL文（同一の文字列を使い回し、SQLiteの文キャッシュに確実に当てる）
+    _SQL_ADD_SHORTCUT = '''
+        INSERT INTO shortcuts (name, command, target_type, icon_path)
+        VALUES (?, ?, ?, ?)
+    '''
+    _SQL_IMPORT_SHORTCUT = '''
+        INSERT OR IGNORE INTO shortcuts (name, command, target_type, icon_path)
+        VALUES (?, ?, ?, ?)
+    '''
+    _SQL_MAX_SHORTCUT_ID = 'SELECT COALESCE(MAX(id), 0) FROM shortcuts'
+    _SQL_AUDIT_IMPORTED = '''
+        INSERT INTO audit_log (action, shortcut_name, details)
+        SELECT 'ADD', name, 'Target: ' || target_type
+        FROM shortcuts
+        WHERE id > ?
+        ORDER BY id
+    '''
+    _SQL_ADD_AUDIT_AT = '''
+        INSERT INTO audit_log (action, shortcut_name, details, timestamp)
+        VALUES (?, ?, ?, ?)
+    '''
+    _SQL_GET_ALL = '''
+        SELECT id, name, command, target_type, icon_path,
+               is_active, is_system_applied, apply_count, created_at
+        FROM shortcuts
+        ORDER BY created_at DESC, id DESC
+    '''
+    _SQL_GET_ACTIVE_FOR_EXPORT = '''
+        SELECT name, command, target_type, icon_path
+        FROM shortcuts
+        WHERE is_active = 1
+        ORDER BY created_at DESC, id DESC
+    '''
+    _SQL_GET_ALL_FOR_DISPLAY = '''
+        SELECT id, name, command, target_type, icon_path,
+               is_active, is_system_applied, apply_count, created_at,
+               CASE WHEN length(command) > 50
+                    THEN substr(command, 1, 50) || '...'
+                    ELSE command
+               END AS command_short
+        FROM shortcuts
+        ORDER BY created_at DESC, id DESC
+    '''
+    _SQL_UPDATE_APPLIED = '''
+        UPDATE shortcuts 
+        SET is_system_applied = ?,
+            apply_count = apply_count + ?
+        WHERE id = ?
+    '''
+    _SQL_GET_NAME = 'SELECT name FROM shortcuts WHERE id = ?'
+    _SQL_GET_KEYS = 'SELECT name, target_type FROM shortcuts'
+    _SQL_DELETE_SHORTCUT = 'DELETE FROM shortcuts WHERE id = ?'
+    _SQL_TOGGLE_ACTIVE = '''
+        UPDATE shortcuts 
+        SET is_active = 1 - is_active
+        WHERE id = ?
+    '''
+    _SQL_ADD_BACKUP = '''
+        INSERT INTO registry_backups (shortcut_name, backup_data)
+        VALUES (?, ?)
+    '''
+    _SQL_GET_AUDIT_LOG = '''
+        SELECT id, action, COALESCE(shortcut_name, ''),
+               COALESCE(details, ''), timestamp
+        FROM audit_log
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ? OFFSET ?
+    '''
+    
     def __init__(self, db_path: str = "context_menu.db") -> None:
         """
         Args:
@@ -26,6 +126,133 @@ class ContextMenuDatabase:
         """
         self.db_path: str = db_path
         self.init_database()
+        
+        # 監査ログはキューに積み、バックグラウンドでまとめて書き込む
+        self._audit_queue: Deque[Tuple[str, str, Optional[str], str]] = deque()
+        self._audit_stop = threading.Event()
+        self._audit_wake = threading.Event()
+        # 書き込みスレッドと呼び出し元スレッドの書き込みを直列化し、キューの順序で記録する
+        self._audit_lock = threading.Lock()
+        self._bulk_depth = 0
+        self._audit_thread = threading.Thread(
+            target=self._audit_writer, name="AuditLogWriter", daemon=True
+        )
+        self._audit_thread.start()
+    
+    def close(self) -> None:
+        """未書き込みの監査ログを保存し、プールされているデータベース接続を閉じる"""
+        self._audit_stop.set()
+        self._audit_wake.set()
+        self._audit_thread.join()
+        self._flush_audit()
+        close_pool(self.db_path)
+    
+    def _log_audit(self, action: str, name: str, details: Optional[str] = None) -> None:
+        """
+        監査ログを書き込みキューに追加する
+        
+        Args:
+            action: 操作種別
+            name: ショートカット名
+            details: 詳細
+        """
+        # 書き込みが遅れても記録時刻は変わらないよう、CURRENT_TIMESTAMP と同じ形式 (UTC) で保持する
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        self._audit_queue.append((action, name, details, timestamp))
+        
+        # 一定件数溜まったら間隔を待たずに書き込ませる（bulk() 中は終了時にまとめる）
+        if not self._bulk_depth and len(self._audit_queue) >= AppConfig.AUDIT_FLUSH_THRESHOLD:
+            self._audit_wake.set()
+    
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """
+        ブロック内の監査ログをブロック終了時に1回でまとめて書き込む
+        
+        件数による途中の書き込みを抑え、連続した追加・削除の監査ログを
+        1回の executemany にまとめる。入れ子にした場合は最も外側の終了時に書き込む
+        """
+        self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self._flush_audit()
+    
+    def _flush_audit(self) -> None:
+        """キューに溜まった監査ログを1トランザクションでまとめて書き込む"""
+        if not self._audit_queue:
+            return
+        
+        with self._audit_lock:
+            rows = []
+            popleft = self._audit_queue.popleft
+            try:
+                while True:
+                    rows.append(popleft())
+            except IndexError:
+                pass
+            
+            if not rows:
+                return
+            
+            try:
+                with DatabaseManager(self.db_path) as conn:
+                    conn.executemany(self._SQL_ADD_AUDIT_AT, rows)
+            except Exception as e:
+                print(f"エラー: 監査ログ書き込み失敗: {e}")
+    
+    def _audit_writer(self) -> None:
+        """監査ログを一定間隔、または一定件数ごとに書き込む（バックグラウンドスレッド）"""
+        while True:
+            self._audit_wake.wait(AppConfig.AUDIT_FLUSH_INTERVAL)
+            self._audit_wake.clear()
+            if self._audit_stop.is_set():
+                return
+            self._flush_audit()
+    
+    def _remove_duplicate_shortcuts(self, cursor) -> None:
+        """
+        一意インデックス作成前に、旧バージョンのデータに残る重複行を削除する
+        
+        (名前, ターゲットタイプ) ごとにシステム適用済みの行、次に最も新しい行を残す。
+        削除した行は監査ログに記録する（呼び出し元のトランザクション内で実行すること）
+        
+        Args:
+            cursor: init_database() のカーソル
+        """
+        cursor.execute('''
+            SELECT id, name, target_type, is_system_applied FROM shortcuts
+            WHERE (name, target_type) IN (
+                SELECT name, target_type FROM shortcuts
+                GROUP BY name, target_type HAVING COUNT(*) > 1
+            )
+            ORDER BY name, target_type, is_system_applied DESC, created_at DESC, id DESC
+        ''')
+        
+        removed: List[Tuple[int, str, str]] = []
+        kept: Dict[Tuple[str, str], int] = {}
+        for row in cursor.fetchall():
+            key = (row['name'], row['target_type'])
+            if key in kept:
+                removed.append((row['id'], row['name'],
+                                f"Duplicate removed on upgrade (id={row['id']}, "
+                                f"target={row['target_type']}, "
+                                f"applied={row['is_system_applied']}, kept id={kept[key]})"))
+            else:
+                kept[key] = row['id']
+        
+        if not removed:
+            return
+        
+        cursor.executemany('DELETE FROM shortcuts WHERE id = ?', [(r[0],) for r in removed])
+        cursor.executemany(
+            "INSERT INTO audit_log (action, shortcut_name, details) VALUES ('DELETE', ?, ?)",
+            [(name, details) for _, name, details in removed]
+        )
+        print(f"警告: 重複したショートカットを{len(removed)}件削除しました: "
+              + ", ".join(f"{name} (id={shortcut_id})" for shortcut_id, name, _ in removed))
     
     def init_database(self) -> None:
         """データベーステーブルを初期化する"""
@@ -90,9 +317,29 @@ class ContextMenuDatabase:
             ''')
             
             # インデックス作成
+            # (名前, ターゲットタイプ) の一意制約。名前単体の検索もこのインデックスで賄う
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                ('idx_shortcuts_name_target',)
+            )
+            if cursor.fetchone() is None:
+                self._remove_duplicate_shortcuts(cursor)
+                cursor.execute('''
+                    CREATE UNIQUE INDEX idx_shortcuts_name_target 
+                    ON shortcuts(name, target_type)
+                ''')
+                cursor.execute('DROP INDEX IF EXISTS idx_shortcuts_name')
+            
+            # 一覧取得 (ORDER BY created_at DESC, id DESC) をソートなしの逆順走査で返す
+            # （id は rowid のため、インデックスの末尾に暗黙に含まれる）
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_shortcuts_created 
+                ON shortcuts(created_at)
+            ''')
+            # エクスポート (WHERE is_active = 1 ORDER BY created_at DESC) 用
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_shortcuts_name 
-                ON shortcuts(name)
+                CREATE INDEX IF NOT EXISTS idx_shortcuts_active_created 
+                ON shortcuts(is_active, created_at)
             ''')
             
             cursor.execute('''
@@ -117,44 +364,107 @@ class ContextMenuDatabase:
         try:
             with DatabaseManager(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO shortcuts (name, command, target_type, icon_path)
-                    VALUES (?, ?, ?, ?)
-                ''', (name, command, target_type, icon_path))
+                cursor.execute(self._SQL_ADD_SHORTCUT,
+                               (name, command, target_type, icon_path))
                 
                 shortcut_id = cursor.lastrowid
-                
-                # 監査ログ記録
-                cursor.execute('''
-                    INSERT INTO audit_log (action, shortcut_name, details)
-                    VALUES (?, ?, ?)
-                ''', ('ADD', name, f'Target: {target_type}'))
-                
-                return shortcut_id
+            
+            # 監査ログ記録（コミット後にキューへ追加）
+            self._log_audit('ADD', name, f'Target: {target_type}')
+            
+            return shortcut_id
                 
         except Exception as e:
             print(f"エラー: ショートカット追加失敗: {e}")
             return None
     
-    def get_all_shortcuts(self) -> List[Dict]:
+    def add_shortcuts(self, rows: List[Tuple[str, str, str, str]]) -> int:
         """
-        すべてのショートカット情報を取得する
+        複数のショートカットを1トランザクションで一括追加する
+        
+        複数行の VALUES 句を使い、1文で _BULK_INSERT_ROWS 行ずつ追加する。
+        1件でも失敗した場合は1件も追加しない
         
+        Args:
+            rows: (名前, コマンド, ターゲットタイプ, アイコンパス) のリスト
+            
         Returns:
-            ショートカット情報のリスト
+            追加された件数 (失敗時は0)
         """
         try:
             with DatabaseManager(self.db_path) as conn:
+                chunk_size = self._BULK_INSERT_ROWS
+                
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    conn.execute(self._bulk_insert_sql(len(chunk)),
+                                 [value for row in chunk for value in row])
+            
+            # 監査ログ記録（コミット後にキューへ追加）
+            for name, _command, target_type, _icon_path in rows:
+                self._log_audit('ADD', name, f'Target: {target_type}')
+            
+            return len(rows)
+                
+        except Exception as e:
+            print(f"エラー: ショートカット一括追加失敗: {e}")
+            return 0
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _bulk_insert_sql(row_count: int) -> str:
+        """
+        指定行数分の VALUES 句を持つ INSERT 文を組み立てる（行数ごとにキャッシュ）
+        
+        同じ行数では同一の文字列オブジェクトを返すため、SQLiteの文キャッシュにも当たる
+        
+        Args:
+            row_count: 1文で追加する行数
+            
+        Returns:
+            INSERT 文
+        """
+        return ('INSERT INTO shortcuts (name, command, target_type, icon_path) VALUES '
+                + ', '.join(['(?, ?, ?, ?)'] * row_count))
+    
+    def get_all_shortcuts(self) -> List[Shortcut]:
+        """
+        すべてのショートカット情報を取得する
+        
+        Returns:
+            ショートカット情報 (Shortcut) のリスト
+        """
+        try:
+            # 読み取りのみのため書き込みロック (BEGIN IMMEDIATE) を取らない
+            with DatabaseManager(self.db_path, transaction=False) as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, name, command, target_type, icon_path,
-                           is_active, is_system_applied, apply_count, created_at
-                    FROM shortcuts
-                    ORDER BY created_at DESC
-                ''')
+                cursor.row_factory = None  # sqlite3.Row を介さずタプルから直接組み立てる
+                cursor.execute(self._SQL_GET_ALL)
+                
+                return [Shortcut(*row) for row in cursor]
+                
+        except Exception as e:
+            print(f"エラー: ショートカット取得失敗: {e}")
+            return []
+    
+    def get_all_shortcuts_for_display(self) -> List[Shortcut]:
+        """
+        一覧表示用にすべてのショートカット情報を取得する
+        
+        get_all_shortcuts() の各列に加え、表示用に50文字で切り詰めた
+        コマンド (command_short) をSQL側で計算して返す
+        
+        Returns:
+            ショートカット情報 (Shortcut) のリスト
+        """
+        try:
+            # 読み取りのみのため書き込みロック (BEGIN IMMEDIATE) を取らない
+            with DatabaseManager(self.db_path, transaction=False) as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None  # sqlite3.Row を介さずタプルから直接組み立てる
+                cursor.execute(self._SQL_GET_ALL_FOR_DISPLAY)
                 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return list(map(Shortcut._make, cursor))
                 
         except Exception as e:
             print(f"エラー: ショートカット取得失敗: {e}")
@@ -171,12 +481,8 @@ class ContextMenuDatabase:
         try:
             with DatabaseManager(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE shortcuts 
-                    SET is_system_applied = ?,
-                        apply_count = apply_count + ?
-                    WHERE id = ?
-                ''', (1 if applied else 0, 1 if applied else 0, shortcut_id))
+                cursor.execute(self._SQL_UPDATE_APPLIED,
+                               (1 if applied else 0, 1 if applied else 0, shortcut_id))
                 
         except Exception as e:
             print(f"エラー: 適用状態更新失敗: {e}")
@@ -196,8 +502,7 @@ class ContextMenuDatabase:
                 cursor = conn.cursor()
                 
                 # ショートカット名取得
-                cursor.execute('SELECT name FROM shortcuts WHERE id = ?', 
-                             (shortcut_id,))
+                cursor.execute(self._SQL_GET_NAME, (shortcut_id,))
                 row = cursor.fetchone()
                 if not row:
                     return False
@@ -205,16 +510,12 @@ class ContextMenuDatabase:
                 name = row['name']
                 
                 # 削除実行
-                cursor.execute('DELETE FROM shortcuts WHERE id = ?', 
-                             (shortcut_id,))
-                
-                # 監査ログ記録
-                cursor.execute('''
-                    INSERT INTO audit_log (action, shortcut_name)
-                    VALUES (?, ?)
-                ''', ('DELETE', name))
-                
-                return True
+                cursor.execute(self._SQL_DELETE_SHORTCUT, (shortcut_id,))
+            
+            # 監査ログ記録（コミット後にキューへ追加）
+            self._log_audit('DELETE', name)
+            
+            return True
                 
         except Exception as e:
             print(f"エラー: ショートカット削除失敗: {e}")
@@ -233,11 +534,7 @@ class ContextMenuDatabase:
         try:
             with DatabaseManager(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE shortcuts 
-                    SET is_active = 1 - is_active
-                    WHERE id = ?
-                ''', (shortcut_id,))
+                cursor.execute(self._SQL_TOGGLE_ACTIVE, (shortcut_id,))
                 
                 return True
                 
@@ -256,85 +553,146 @@ class ContextMenuDatabase:
         try:
             with DatabaseManager(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO registry_backups (shortcut_name, backup_data)
-                    VALUES (?, ?)
-                ''', (name, json.dumps(backup_data, ensure_ascii=False)))
+                cursor.execute(self._SQL_ADD_BACKUP,
+                               (name, json.dumps(backup_data, ensure_ascii=False)))
                 
         except Exception as e:
             print(f"エラー: バックアップ保存失敗: {e}")
     
-    def get_audit_log(self, limit: int = 100) -> List[Dict]:
+    def get_audit_log(self, limit: int = 100, offset: int = 0) -> List[AuditRow]:
         """
         監査ログを取得する
         
         Args:
             limit: 取得件数
+            offset: 先頭から読み飛ばす件数（ページ単位の読み込みに使用）
             
         Returns:
-            監査ログのリスト
+            監査ログ (AuditRow) のリスト
         """
+        # キューに残っている監査ログを先に書き込む
+        self._flush_audit()
+        
         try:
-            with DatabaseManager(self.db_path) as conn:
+            # 読み取りのみのため書き込みロック (BEGIN IMMEDIATE) を取らない
+            with DatabaseManager(self.db_path, transaction=False) as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, action, shortcut_name, details, timestamp
-                    FROM audit_log
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (limit,))
+                cursor.execute(self._SQL_GET_AUDIT_LOG, (limit, offset))
                 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                return list(map(AuditRow._make, cursor))
                 
         except Exception as e:
             print(f"エラー: 監査ログ取得失敗: {e}")
             return []
     
+    @staticmethod
+    def _export_file_mode(filepath: str) -> int:
+        """
+        エクスポートファイルに設定する権限を取得する
+        
+        Args:
+            filepath: エクスポート先ファイルパス
+            
+        Returns:
+            既存ファイルの権限。存在しない場合は open() で新規作成した場合と同じ権限
+        """
+        try:
+            return stat.S_IMODE(os.stat(filepath).st_mode)
+        except FileNotFoundError:
+            # umask は取得と同時に設定する API しかないため、読み出してすぐ元に戻す
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+    
     def export_to_json(self, filepath: str) -> None:
         """
         設定をJSONファイルにエクスポートする
         
+        ショートカットはカーソルから1件ずつ読み出して書き込むため、
+        件数が多くても全件をメモリに展開しない。有効なショートカットの
+        抽出は1つのSELECT文で行うため、全行が同じスナップショットから読まれる
+        
         Args:
             filepath: エクスポート先ファイルパス
         """
         try:
-            shortcuts = self.get_all_shortcuts()
-            
-            export_data = {
+            header = {
                 'export_date': datetime.now().isoformat(),
                 'version': '2.1',
-                'app': 'Context Menu Manager',
-                'shortcuts': [
-                    {
-                        'name': s['name'],
-                        'command': s['command'],
-                        'target_type': s['target_type'],
-                        'icon_path': s['icon_path']
-                    }
-                    for s in shortcuts if s['is_active']
-                ]
+                'app': 'Context Menu Manager'
             }
+            encode = json.JSONEncoder(ensure_ascii=False, indent=2).encode
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            # 途中で失敗しても既存のファイルを壊さないよう、同じディレクトリの
+            # 一時ファイルに書き出し、完了後に置き換える
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=os.path.basename(filepath) + '.',
+                suffix='.tmp',
+                dir=os.path.dirname(os.path.abspath(filepath))
+            )
+        except Exception as e:
+            raise Exception(f"エラー: エクスポート失敗: {e}")
+        
+        try:
+            # json.dump(..., indent=2) と同じ形式で書き出す
+            # 1件ごとの小さな書き込みをまとめるため、大きめのバッファで開く
+            with open(fd, 'w', encoding='utf-8',
+                      buffering=AppConfig.EXPORT_BUFFER_SIZE) as f:
+                write = f.write
+                write('{\n')
+                for key, value in header.items():
+                    write(f'  {encode(key)}: {encode(value)},\n')
+                write('  "shortcuts": [')
+                
+                count = 0
+                # 読み取りのみのため書き込みロック (BEGIN IMMEDIATE) を取らない
+                with DatabaseManager(self.db_path, transaction=False) as conn:
+                    for name, command, target_type, icon_path in conn.execute(
+                            self._SQL_GET_ACTIVE_FOR_EXPORT):
+                        item = encode({
+                            'name': name,
+                            'command': command,
+                            'target_type': target_type,
+                            'icon_path': icon_path
+                        })
+                        # 配列要素として2段階分インデントする（文字列内の改行はエスケープ済み）
+                        write((',\n    ' if count else '\n    ') + item.replace('\n', '\n    '))
+                        count += 1
                 
+                write('\n  ]\n}' if count else ']\n}')
+            
+            # mkstemp の一時ファイルは所有者のみ (0600) のため、既存ファイルの権限
+            # （新規作成の場合は umask に従った通常の権限）に合わせてから置き換える
+            os.chmod(tmp_path, self._export_file_mode(filepath))
+            os.replace(tmp_path, filepath)
+            
         except Exception as e:
+            with suppress(OSError):
+                os.unlink(tmp_path)
             raise Exception(f"エラー: エクスポート失敗: {e}")
     
-    def import_from_json(self, filepath: str) -> Tuple[int, int, List[str]]:
+    def import_from_json(self, filepath: str,
+                         bulk: bool = True) -> Tuple[int, int, List[str]]:
         """
         JSONファイルから設定をインポートする
         
         Args:
             filepath: インポート元ファイルパス
+            bulk: Trueの場合、全件を1トランザクションでまとめて追加する
+                  （途中で失敗した場合は1件も追加しない）。Falseの場合は
+                  1件ずつ add_shortcut() で追加し、失敗した項目のみエラーにする
             
         Returns:
             (成功件数, スキップ件数, エラーリスト)
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if orjson is not None:
+                # バイト列のまま解析し、UTF-8デコードとパースを1回で行う
+                with open(filepath, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             
             # セキュリティ検証
             is_valid, message, sanitized_data = SecurityValidator.sanitize_json_import(data)
@@ -342,6 +700,9 @@ class ContextMenuDatabase:
             if not is_valid:
                 return 0, 0, [message]
             
+            if bulk:
+                return self._bulk_import_shortcuts(sanitized_data['shortcuts'])
+            
             success_count = 0
             skip_count = 0
             errors: List[str] = []
@@ -349,35 +710,68 @@ class ContextMenuDatabase:
             # 🟡 修正5: 重複チェックを一括実行（パフォーマンス改善）
             with DatabaseManager(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT name, target_type FROM shortcuts')
+                cursor.execute(self._SQL_GET_KEYS)
                 existing: Set[Tuple[str, str]] = {(row['name'], row['target_type']) 
                                                    for row in cursor.fetchall()}
             
-            for shortcut in sanitized_data['shortcuts']:
-                # 重複チェック
-                if (shortcut['name'], shortcut['target_type']) in existing:
-                    skip_count += 1
-                    continue
-                
-                # 追加
-                result = self.add_shortcut(
-                    name=shortcut['name'],
-                    command=shortcut['command'],
-                    target_type=shortcut['target_type'],
-                    icon_path=shortcut.get('icon_path', '')
-                )
-                
-                if result:
-                    success_count += 1
-                    # 成功したアイテムを既存セットに追加
-                    existing.add((shortcut['name'], shortcut['target_type']))
-                else:
-                    errors.append(f"{shortcut['name']}: 追加失敗")
+            # 監査ログはループ終了時にまとめて書き込む
+            with self.bulk():
+                for shortcut in sanitized_data['shortcuts']:
+                    # 重複チェック
+                    if (shortcut['name'], shortcut['target_type']) in existing:
+                        skip_count += 1
+                        continue
+                    
+                    # 追加
+                    result = self.add_shortcut(
+                        name=shortcut['name'],
+                        command=shortcut['command'],
+                        target_type=shortcut['target_type'],
+                        icon_path=shortcut.get('icon_path', '')
+                    )
+                    
+                    if result:
+                        success_count += 1
+                        # 成功したアイテムを既存セットに追加
+                        existing.add((shortcut['name'], shortcut['target_type']))
+                    else:
+                        errors.append(f"{shortcut['name']}: 追加失敗")
             
             return success_count, skip_count, errors
             
         except Exception as e:
             return 0, 0, [f"エラー: インポート失敗: {e}"]
+    
+    def _bulk_import_shortcuts(self, shortcuts: List[Dict]) -> Tuple[int, int, List[str]]:
+        """
+        サニタイズ済みのショートカットを1トランザクションで一括追加する
+        
+        重複 (名前, ターゲットタイプ) の判定はUNIQUEインデックスと
+        INSERT OR IGNORE に任せ、既存行をPython側に読み込まない
+        
+        Args:
+            shortcuts: サニタイズ済みショートカットのリスト
+            
+        Returns:
+            (成功件数, スキップ件数, エラーリスト)
+        """
+        try:
+            with DatabaseManager(self.db_path) as conn:
+                # AUTOINCREMENT のため、このトランザクションで追加された行は既存の最大IDより大きい
+                last_id = conn.execute(self._SQL_MAX_SHORTCUT_ID).fetchone()[0]
+                
+                conn.executemany(self._SQL_IMPORT_SHORTCUT,
+                                 [(shortcut['name'], shortcut['command'],
+                                   shortcut['target_type'], shortcut.get('icon_path', ''))
+                                  for shortcut in shortcuts])
+                
+                # 監査ログ記録（追加された行のみを1文で記録する）
+                success_count = conn.execute(self._SQL_AUDIT_IMPORTED, (last_id,)).rowcount
+            
+            return success_count, len(shortcuts) - success_count, []
+            
+        except Exception as e:
+            return 0, 0, [f"エラー: 一括インポート失敗: {e}"]
 
 
 # ✅ チェック完了: models/database.py
@@ -8,10 +8,11 @@ Version: 1.0.0
 
 import sys
 import os
+import queue
+import sqlite3
 import unittest
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from datetime import datetime
 import traceback
 
@@ -19,22 +20,65 @@ import traceback
 # テストモジュールをインポートするためのパス設定
 sys.path.insert(0, os.path.dirname(__file__))
 
+from config import AppConfig
+from core.database import DatabaseManager
+from core.security import SecurityValidator
+from models.database import ContextMenuDatabase
+from utils import TARGET_TYPES, SAFE_EXECUTABLES, DANGEROUS_PATTERNS
+
+# winreg を使うため Windows でのみ読み込む（それ以外では main() が起動前に終了する）
+if sys.platform == 'win32':
+    from core.compatibility import SystemCompatibility
+
+# Tkinter は GUI 起動時に _load_tk() で読み込む
+# （Windows以外での終了時やモジュールを読み込むだけの場合に読み込みコストを払わない）
+if TYPE_CHECKING:
+    import tkinter as tk
+    from tkinter import ttk, scrolledtext, messagebox
+else:
+    tk = ttk = scrolledtext = messagebox = None
+
+
+def _load_tk():
+    """Tkinter モジュールを読み込み、モジュール全体から参照できるようにする"""
+    global tk, ttk, scrolledtext, messagebox
+    import tkinter as tk
+    from tkinter import ttk, scrolledtext, messagebox
+
+
+# ログの区切り線
+_SEP = "=" * 50 + "\n"
+
+# 実行結果を画面へ反映する間隔（ミリ秒）
+_DRAIN_INTERVAL_MS = 100
+
+# データベーステスト用のインメモリDB（接続プールが1接続を保持する間だけ存在する）
+MEMORY_DB = ":memory:"
+
 
 class TestCase:
     """個別のテストケース情報を保持するクラス"""
 
-    def __init__(self, name: str, description: str, test_func, category: str):
+    # 属性を固定し、インスタンスごとの属性辞書を持たせない
+    __slots__ = ('name', 'description', 'test_func', 'category', 'parallel',
+                 'result', 'error_msg')
+
+    def __init__(self, name: str, description: str, test_func, category: str,
+                 parallel: bool = True):
         """
         Args:
             name: テスト名
             description: テストの説明
             test_func: テスト関数
             category: カテゴリ
+            parallel: 他のテストと並列実行できる場合True
+                      （共有状態に触れるテストはFalseにして順番に実行する）
         """
         self.name = name
         self.description = description
         self.test_func = test_func
         self.category = category
+        self.parallel = parallel
         self.result: Optional[str] = None
         self.error_msg: Optional[str] = None
 
@@ -44,6 +88,10 @@ class TestRegistry:
 
     def __init__(self):
         self.test_cases: List[TestCase] = []
+        # 登録時に作成する索引
+        self._by_category: Dict[str, List[TestCase]] = {}
+        self._by_name: Dict[str, TestCase] = {}
+        self._sorted_categories: Optional[List[str]] = None
         self._register_all_tests()
 
     def _register_all_tests(self):
@@ -71,26 +119,29 @@ class TestRegistry:
             "セキュリティ"
         )
 
-        # カテゴリ: データベース
+        # カテゴリ: データベース（同じインメモリDBを使うため順番に実行する）
         self.register_test(
             "データベース - 初期化",
             "データベーステーブルの作成テスト",
             self._test_database_init,
-            "データベース"
+            "データベース",
+            parallel=False
         )
 
         self.register_test(
             "データベース - ショートカット追加",
-            "ショートカットの追加・取得テスト",
+            "ショートカットの追加・一括追加・取得テスト",
             self._test_database_add_shortcut,
-            "データベース"
+            "データベース",
+            parallel=False
         )
 
         self.register_test(
             "データベース - ショートカット削除",
             "ショートカットの削除テスト",
             self._test_database_delete_shortcut,
-            "データベース"
+            "データベース",
+            parallel=False
         )
 
         # カテゴリ: システム互換性
@@ -124,18 +175,28 @@ class TestRegistry:
             "ユーティリティ"
         )
 
-    def register_test(self, name: str, description: str, test_func, category: str):
+    def register_test(self, name: str, description: str, test_func, category: str,
+                      parallel: bool = True):
         """テストケースを登録する"""
-        self.test_cases.append(TestCase(name, description, test_func, category))
+        test_case = TestCase(name, description, test_func, category, parallel)
+        self.test_cases.append(test_case)
+        self._by_category.setdefault(category, []).append(test_case)
+        self._by_name[name] = test_case
+        self._sorted_categories = None
 
     def get_categories(self) -> List[str]:
         """カテゴリ一覧を取得する"""
-        categories = list(set(tc.category for tc in self.test_cases))
-        return sorted(categories)
+        if self._sorted_categories is None:
+            self._sorted_categories = sorted(self._by_category)
+        return self._sorted_categories
 
     def get_tests_by_category(self, category: str) -> List[TestCase]:
         """特定カテゴリのテストを取得する"""
-        return [tc for tc in self.test_cases if tc.category == category]
+        return self._by_category.get(category, [])
+
+    def get_test_by_name(self, name: str) -> Optional[TestCase]:
+        """テスト名からテストケースを取得する（カテゴリ名の場合はNone）"""
+        return self._by_name.get(name)
 
     # ===============================
     # テスト実装
@@ -143,7 +204,6 @@ class TestRegistry:
 
     def _test_security_command_validation(self) -> Dict[str, any]:
         """セキュリティ - コマンド検証テスト"""
-        from core.security import SecurityValidator
 
         results = []
 
@@ -169,7 +229,6 @@ class TestRegistry:
 
     def _test_security_name_validation(self) -> Dict[str, any]:
         """セキュリティ - 名前検証テスト"""
-        from core.security import SecurityValidator
 
         results = []
 
@@ -195,7 +254,6 @@ class TestRegistry:
 
     def _test_security_icon_validation(self) -> Dict[str, any]:
         """セキュリティ - アイコンパス検証テスト"""
-        from core.security import SecurityValidator
 
         results = []
 
@@ -216,47 +274,47 @@ class TestRegistry:
 
     def _test_database_init(self) -> Dict[str, any]:
         """データベース - 初期化テスト"""
-        import tempfile
-        from models.database import ContextMenuDatabase
 
-        # 一時ファイルでテスト
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
-            tmp_path = tmp.name
+        # ファイルI/Oを避けるためインメモリDBでテスト
 
+        db = None
         try:
-            db = ContextMenuDatabase(tmp_path)
+            db = ContextMenuDatabase(MEMORY_DB)
 
             # テーブルが作成されているか確認
-            from core.database import DatabaseManager
-            with DatabaseManager(tmp_path) as conn:
+            with DatabaseManager(MEMORY_DB, transaction=False) as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [row[0] for row in cursor.fetchall()]
+                # SQLite内部のテーブル (sqlite_*) は対象外
+                if sqlite3.sqlite_version_info >= (3, 37, 0):
+                    # PRAGMA table_list: (schema, name, type, ...)
+                    cursor.execute("PRAGMA main.table_list")
+                    tables = {row[1] for row in cursor
+                              if row[2] == 'table' and not row[1].startswith('sqlite_')}
+                else:
+                    cursor.execute("SELECT name FROM sqlite_master "
+                                   "WHERE type='table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'")
+                    tables = {row[0] for row in cursor}
 
-            required_tables = ['shortcuts', 'settings', 'audit_log', 'registry_backups']
-            missing_tables = [t for t in required_tables if t not in tables]
+            required_tables = {'shortcuts', 'settings', 'audit_log', 'registry_backups'}
+            missing_tables = sorted(required_tables - tables)
 
             assert not missing_tables, f"必要なテーブルが作成されていません: {missing_tables}"
 
             return {
                 "success": True,
-                "message": f"データベース初期化成功\n作成されたテーブル: {', '.join(tables)}"
+                "message": f"データベース初期化成功\n作成されたテーブル: {', '.join(sorted(tables))}"
             }
         finally:
-            # クリーンアップ
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            # クリーンアップ（プールを閉じるとインメモリDBも破棄される）
+            if db is not None:
+                db.close()
 
     def _test_database_add_shortcut(self) -> Dict[str, any]:
         """データベース - ショートカット追加テスト"""
-        import tempfile
-        from models.database import ContextMenuDatabase
-
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
-            tmp_path = tmp.name
 
+        db = None
         try:
-            db = ContextMenuDatabase(tmp_path)
+            db = ContextMenuDatabase(MEMORY_DB)
 
             # ショートカット追加
             shortcut_id = db.add_shortcut(
@@ -271,26 +329,31 @@ class TestRegistry:
             # 取得して確認
             shortcuts = db.get_all_shortcuts()
             assert len(shortcuts) == 1, "ショートカットが取得できません"
-            assert shortcuts[0]['name'] == "テストショートカット", "ショートカット名が一致しません"
+            assert shortcuts[0].name == "テストショートカット", "ショートカット名が一致しません"
+
+            # 一括追加
+            rows = [(f"一括テスト{i}", "notepad.exe %1", "all_files", "") for i in range(100)]
+            added = db.add_shortcuts(rows)
+            assert added == 100, f"一括追加の件数が一致しません: {added}"
+
+            total = len(db.get_all_shortcuts())
+            assert total == 101, f"一括追加後の件数が一致しません: {total}"
 
             return {
                 "success": True,
-                "message": f"ショートカット追加成功 (ID: {shortcut_id})\n取得されたショートカット: {shortcuts[0]['name']}"
+                "message": (f"ショートカット追加成功 (ID: {shortcut_id})\n取得されたショートカット: {shortcuts[0].name}\n"
+                            f"一括追加: {added}件 (合計 {total}件)")
             }
         finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            if db is not None:
+                db.close()
 
     def _test_database_delete_shortcut(self) -> Dict[str, any]:
         """データベース - ショートカット削除テスト"""
-        import tempfile
-        from models.database import ContextMenuDatabase
-
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
-            tmp_path = tmp.name
 
+        db = None
         try:
-            db = ContextMenuDatabase(tmp_path)
+            db = ContextMenuDatabase(MEMORY_DB)
 
             # ショートカット追加
             shortcut_id = db.add_shortcut(
@@ -312,12 +375,11 @@ class TestRegistry:
                 "message": "ショートカット削除成功"
             }
         finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            if db is not None:
+                db.close()
 
     def _test_system_version(self) -> Dict[str, any]:
         """システム - Windowsバージョン取得テスト"""
-        from core.compatibility import SystemCompatibility
 
         major, build = SystemCompatibility.get_windows_version()
 
@@ -332,7 +394,6 @@ class TestRegistry:
 
     def _test_system_registry_path(self) -> Dict[str, any]:
         """システム - レジストリパス取得テスト"""
-        from core.compatibility import SystemCompatibility
 
         results = []
 
@@ -350,7 +411,6 @@ class TestRegistry:
 
     def _test_config_values(self) -> Dict[str, any]:
         """設定 - アプリケーション設定テスト"""
-        from config import AppConfig
 
         results = []
 
@@ -377,7 +437,6 @@ class TestRegistry:
 
     def _test_utils_constants(self) -> Dict[str, any]:
         """ユーティリティ - 定数確認テスト"""
-        from utils import TARGET_TYPES, SAFE_EXECUTABLES, DANGEROUS_PATTERNS
 
         results = []
 
@@ -399,10 +458,42 @@ class TestRegistry:
         }
 
 
+def _run_test_case(test_case: TestCase, show_traceback: bool = False) -> Tuple[str, str, List[str]]:
+    """
+    テストケースを実行する（ワーカースレッドで呼ばれる）
+
+    Args:
+        test_case: 実行するテストケース
+        show_traceback: 例外発生時にトレースバックをログに含める場合True
+
+    Returns:
+        (結果, ツリービューのタグ, ログ行のリスト)
+    """
+    # 戻り値の評価も含めて try 内で行い、例外が実行スレッドの外へ漏れないようにする
+    try:
+        result = test_case.test_func()
+        if result.get("success"):
+            status, tag, lines = "成功", "success", ["  ✓ 成功\n"]
+        else:
+            status, tag, lines = "失敗", "failure", ["  ✗ 失敗\n"]
+        if result.get("message"):
+            lines.append(f"  {result['message']}\n")
+        return status, tag, lines
+    except AssertionError as e:
+        test_case.error_msg = str(e)
+        return "失敗", "failure", [f"  ✗ アサーションエラー: {e}\n"]
+    except Exception as e:
+        test_case.error_msg = str(e)
+        lines = [f"  ✗ エラー: {e}\n"]
+        if show_traceback:
+            lines.append(f"  {traceback.format_exc()}\n")
+        return "エラー", "error", lines
+
+
 class TestRunnerGUI:
     """GUIテストランナー"""
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: "tk.Tk"):
         self.root = root
         self.root.title("Context Menu Manager - テストランナー")
         self.root.geometry("900x700")
@@ -410,6 +501,21 @@ class TestRunnerGUI:
         self.registry = TestRegistry()
         self.selected_tests: List[TestCase] = []
 
+        # 並列実行の状態（結果はワーカーからキュー経由で受け取る）
+        self._result_queue: queue.Queue = queue.Queue()
+        self._running = False
+        self._pending = 0
+        self._total = 0
+        self._success_count = 0
+        self._failure_count = 0
+
+        # テスト名 → ツリービューの項目ID
+        self._tree_item_by_name: Dict[str, str] = {}
+        # ツリービューの項目ID → 説明（Tkから値を読み直さずに済むよう保持する）
+        self._descriptions: Dict[str, str] = {}
+        # 未反映のステータス更新（テスト名 → (結果, タグ)）
+        self._pending_updates: Dict[str, Tuple[str, str]] = {}
+
         self._create_widgets()
         self._load_test_list()
 
@@ -446,6 +552,11 @@ class TestRunnerGUI:
         self.tree.column("description", width=250)
         self.tree.column("status", width=80)
 
+        # 結果ごとの色分け
+        self.tree.tag_configure("success", foreground="green")
+        self.tree.tag_configure("failure", foreground="red")
+        self.tree.tag_configure("error", foreground="orange")
+
         # スクロールバー
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
@@ -493,6 +604,15 @@ class TestRunnerGUI:
         )
         clear_btn.grid(row=0, column=2, padx=5)
 
+        # トレースバック表示の切り替え（無効時はスタックの整形を行わない）
+        self._show_tb = tk.BooleanVar(value=False)
+        show_tb_check = ttk.Checkbutton(
+            button_frame,
+            text="トレースバックを表示",
+            variable=self._show_tb
+        )
+        show_tb_check.grid(row=0, column=3, padx=5)
+
         # グリッド設定
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
@@ -512,13 +632,15 @@ class TestRunnerGUI:
             category_id = self.tree.insert("", tk.END, text=category, values=("", ""))
 
             for test_case in self.registry.get_tests_by_category(category):
-                self.tree.insert(
+                iid = self.tree.insert(
                     category_id,
                     tk.END,
                     text=test_case.name,
                     values=(test_case.description, "未実行"),
                     tags=(test_case.name,)
                 )
+                self._tree_item_by_name[test_case.name] = iid
+                self._descriptions[iid] = test_case.description
 
     def _run_selected_tests(self):
         """選択したテストを実行する"""
@@ -531,12 +653,10 @@ class TestRunnerGUI:
         # 選択されたテストを取得
         tests_to_run = []
         for item in selected_items:
-            item_text = self.tree.item(item, "text")
             # カテゴリではなくテストケースのみを実行
-            for test_case in self.registry.test_cases:
-                if test_case.name == item_text:
-                    tests_to_run.append(test_case)
-                    break
+            test_case = self.registry.get_test_by_name(self.tree.item(item, "text"))
+            if test_case is not None:
+                tests_to_run.append(test_case)
 
         if not tests_to_run:
             messagebox.showwarning("警告", "実行可能なテストが選択されていません")
@@ -549,102 +669,135 @@ class TestRunnerGUI:
         self._execute_tests(self.registry.test_cases)
 
     def _execute_tests(self, tests: List[TestCase]):
-        """テストを実行する"""
+        """テストを実行する（ワーカースレッドで並列実行し、結果はキュー経由で受け取る）"""
+        if self._running:
+            messagebox.showwarning("警告", "テストを実行中です")
+            return
+
         self._clear_results()
-        self._log(f"=== テスト実行開始: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-        self._log(f"実行テスト数: {len(tests)}\n\n")
+        start_ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._log_many([f"=== テスト実行開始: {start_ts} ===\n",
+                        f"実行テスト数: {len(tests)}\n\n"])
+
+        self._running = True
+        self._pending = len(tests)
+        self._total = len(tests)
+        self._success_count = 0
+        self._failure_count = 0
+
+        # ワーカーからTk変数を参照しないよう、実行開始時の値を渡す
+        show_traceback = self._show_tb.get()
+
+        parallel_tests = [tc for tc in tests if tc.parallel]
+        serial_tests = [tc for tc in tests if not tc.parallel]
+
+        # 並列実行可能なテストはCPUコア数に応じたワーカーで実行する
+        if parallel_tests:
+            workers = min(len(parallel_tests), max(1, (os.cpu_count() or 1) - 2))
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TestWorker")
+            for test_case in parallel_tests:
+                executor.submit(self._run_and_post, test_case, show_traceback)
+            executor.shutdown(wait=False)
+
+        # 共有状態に触れるテストは1つのワーカーで順番に実行する
+        if serial_tests:
+            serial_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TestSerial")
+            for test_case in serial_tests:
+                serial_executor.submit(self._run_and_post, test_case, show_traceback)
+            serial_executor.shutdown(wait=False)
+
+        self.root.after(_DRAIN_INTERVAL_MS, self._drain_results)
+
+    def _run_and_post(self, test_case: TestCase, show_traceback: bool):
+        """テストを実行し、結果をキューへ送る（ワーカースレッドで呼ばれる）"""
+        self._result_queue.put((test_case,) + _run_test_case(test_case, show_traceback))
+
+    def _drain_results(self):
+        """キューに届いたテスト結果を表示する"""
+        while True:
+            try:
+                test_case, status, tag, lines = self._result_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._report_result(test_case, status, tag, lines)
+            self._pending -= 1
 
-        success_count = 0
-        failure_count = 0
+        # この間に完了したテストのステータスをまとめて反映する
+        self._flush_updates()
 
-        for test_case in tests:
-            self._log(f"▶ {test_case.name}\n")
-            self._log(f"  説明: {test_case.description}\n")
+        if self._pending > 0:
+            self.root.after(_DRAIN_INTERVAL_MS, self._drain_results)
+        else:
+            self._finish_tests()
 
-            try:
-                # テスト実行
-                result = test_case.test_func()
-
-                if result.get("success"):
-                    success_count += 1
-                    test_case.result = "成功"
-                    self._log(f"  ✓ 成功\n")
-                    if result.get("message"):
-                        self._log(f"  {result['message']}\n")
-
-                    # ツリービューを更新
-                    self._update_tree_status(test_case.name, "成功", "success")
-                else:
-                    failure_count += 1
-                    test_case.result = "失敗"
-                    self._log(f"  ✗ 失敗\n")
-                    if result.get("message"):
-                        self._log(f"  {result['message']}\n")
-
-                    self._update_tree_status(test_case.name, "失敗", "failure")
-
-            except AssertionError as e:
-                failure_count += 1
-                test_case.result = "失敗"
-                test_case.error_msg = str(e)
-                self._log(f"  ✗ アサーションエラー: {e}\n")
-                self._update_tree_status(test_case.name, "失敗", "failure")
-
-            except Exception as e:
-                failure_count += 1
-                test_case.result = "エラー"
-                test_case.error_msg = str(e)
-                self._log(f"  ✗ エラー: {e}\n")
-                self._log(f"  {traceback.format_exc()}\n")
-                self._update_tree_status(test_case.name, "エラー", "error")
-
-            self._log("\n")
+    def _report_result(self, test_case: TestCase, status: str, tag: str, lines: List[str]):
+        """1件のテスト結果をログとツリービューに反映する"""
+        test_case.result = status
+        if tag == "success":
+            self._success_count += 1
+        else:
+            self._failure_count += 1
+
+        # 1件分のログをまとめて1回で追加する
+        self._log_many([f"▶ {test_case.name}\n",
+                        f"  説明: {test_case.description}\n",
+                        *lines,
+                        "\n"])
+
+        # ツリービューの更新は _flush_updates() でまとめて行う
+        self._pending_updates[test_case.name] = (status, tag)
+
+    def _flush_updates(self):
+        """溜まったステータス更新をツリービューへまとめて反映する"""
+        if not self._pending_updates:
+            return
+
+        for test_name, (status, tag) in self._pending_updates.items():
+            self._update_tree_status(test_name, status, tag)
+        self._pending_updates.clear()
+
+    def _finish_tests(self):
+        """サマリーを表示してテスト実行を終了する"""
+        self._running = False
 
         # サマリー
-        self._log("=" * 50 + "\n")
-        self._log(f"テスト完了\n")
-        self._log(f"成功: {success_count} / 失敗: {failure_count} / 合計: {len(tests)}\n")
-        self._log("=" * 50 + "\n")
+        self._log_many([_SEP,
+                        "テスト完了\n",
+                        f"成功: {self._success_count} / 失敗: {self._failure_count} / 合計: {self._total}\n",
+                        _SEP])
 
         # 結果メッセージ
-        if failure_count == 0:
-            messagebox.showinfo("完了", f"すべてのテストが成功しました！\n成功: {success_count}")
+        if self._failure_count == 0:
+            messagebox.showinfo("完了", f"すべてのテストが成功しました！\n成功: {self._success_count}")
         else:
-            messagebox.showwarning("完了", f"一部のテストが失敗しました。\n成功: {success_count} / 失敗: {failure_count}")
+            messagebox.showwarning("完了", f"一部のテストが失敗しました。\n成功: {self._success_count} / 失敗: {self._failure_count}")
 
     def _update_tree_status(self, test_name: str, status: str, tag: str):
         """ツリービューのステータスを更新する"""
-        for item in self.tree.get_children():
-            for child in self.tree.get_children(item):
-                if self.tree.item(child, "text") == test_name:
-                    self.tree.item(child, values=(self.tree.item(child, "values")[0], status))
-
-                    # 色分け
-                    if tag == "success":
-                        self.tree.item(child, tags=(tag,))
-                        self.tree.tag_configure("success", foreground="green")
-                    elif tag == "failure":
-                        self.tree.item(child, tags=(tag,))
-                        self.tree.tag_configure("failure", foreground="red")
-                    elif tag == "error":
-                        self.tree.item(child, tags=(tag,))
-                        self.tree.tag_configure("error", foreground="orange")
+        iid = self._tree_item_by_name[test_name]
+        self.tree.item(iid, values=(self._descriptions[iid], status), tags=(tag,))
 
     def _log(self, message: str):
-        """結果テキストエリアにログを出力する"""
+        """
+        結果テキストエリアにログを出力する
+
+        再描画はイベントループに任せる（結果はキュー処理の after コールバックから
+        追加されるため、ここで update() を呼んでイベントキューを回す必要はない）
+        """
         self.result_text.insert(tk.END, message)
         self.result_text.see(tk.END)
-        self.root.update()
+
+    def _log_many(self, lines: List[str]):
+        """複数行をまとめて1回で結果テキストエリアに出力する"""
+        self._log("".join(lines))
 
     def _clear_results(self):
         """結果をクリアする"""
         self.result_text.delete(1.0, tk.END)
 
-        # すべてのステータスを「未実行」に戻す
-        for item in self.tree.get_children():
-            for child in self.tree.get_children(item):
-                values = self.tree.item(child, "values")
-                self.tree.item(child, values=(values[0], "未実行"))
+        # すべてのステータスを「未実行」に戻し、結果の色分けも解除する
+        for iid, description in self._descriptions.items():
+            self.tree.item(iid, values=(description, "未実行"), tags=())
 
 
 def main():
@@ -655,6 +808,7 @@ def main():
         print("エラー: このツールはWindowsでのみ動作します")
         sys.exit(1)
 
+    _load_tk()
     root = tk.Tk()
     app = TestRunnerGUI(root)
     root.mainloop()
@@ -0,0 +1,77 @@
+"""
+Context Menu Manager - 非同期タスク管理モジュールのユニットテスト
+Version: 1.0.0
+最終更新: 2025-01-03
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# パス設定
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config import AppConfig
+from managers.async_task import AsyncTaskManager
+
+
+class TestAsyncTaskManager(unittest.TestCase):
+    """AsyncTaskManagerクラスのテスト"""
+
+    def setUp(self):
+        """テストのセットアップ"""
+        self.results = []
+        self.manager = AsyncTaskManager(lambda *result: self.results.append(result))
+
+    def tearDown(self):
+        """テストのクリーンアップ"""
+        self.manager.stop()
+
+    def test_run_async_success_and_error(self):
+        """成功・失敗の結果がキュー経由でコールバックに渡されるかのテスト"""
+        done = threading.Event()
+
+        def fail():
+            raise ValueError("失敗")
+
+        self.manager.run_async('ok', lambda: 42)
+        self.manager.run_async('ng', fail)
+        self.manager.run_async('done', done.set)
+        self.assertTrue(done.wait(5))
+        while len(self.results) < 3:
+            self.manager.check_queue()
+
+        results = {tag: (status, result) for tag, status, result in self.results}
+        self.assertEqual(results['ok'], ('success', 42))
+        self.assertEqual(results['ng'], ('error', "失敗"))
+
+    def test_workers_are_daemon(self):
+        """応答しないタスクがプロセス終了を妨げないよう、ワーカーがデーモンスレッドかのテスト"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.manager.run_async('hang', release.wait)
+
+        self.assertTrue(self.manager._workers)
+        self.assertTrue(all(worker.daemon for worker in self.manager._workers))
+
+    def test_stop_discards_pending_tasks(self):
+        """停止時に未着手のタスクが実行されないかのテスト"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = []
+        # すべてのワーカーを待機させ、後続のタスクを未着手のまま残す
+        for _ in range(AppConfig.ASYNC_MAX_WORKERS):
+            self.manager.run_async('hang', release.wait)
+        self.manager.run_async('pending', started.append, True)
+
+        self.manager.stop()
+        release.set()
+        for worker in self.manager._workers:
+            worker.join(5)
+
+        self.assertEqual(started, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
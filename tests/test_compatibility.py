@@ -7,11 +7,22 @@ Version: 1.0.0
 import sys
 import os
 import unittest
+from unittest import mock
+from datetime import datetime
 
 # パス設定
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from core.compatibility import SystemCompatibility
+from core.compatibility import SystemCompatibility, _read_windows_version
+
+
+# 拡張子ごとの期待されるレジストリパス
+_EXPECTED_EXT_PATHS = {
+    '.txt': r'Software\Classes\.txt\shell',
+    '.py': r'Software\Classes\.py\shell',
+    '.jpg': r'Software\Classes\.jpg\shell',
+    '.pdf': r'Software\Classes\.pdf\shell',
+}
 
 
 class TestSystemCompatibility(unittest.TestCase):
@@ -48,6 +59,25 @@ class TestSystemCompatibility(unittest.TestCase):
         else:
             self.assertLess(major, 11, "Windows 10がWindows 11として誤検出されています")
 
+    def test_get_windows_version_cached(self):
+        """Windowsバージョンがキャッシュされ同じ結果を返すかのテスト"""
+        first = SystemCompatibility.get_windows_version()
+        second = SystemCompatibility.get_windows_version()
+
+        self.assertEqual(first, second, "2回目の取得結果が一致しません")
+
+    def test_get_windows_version_failure_not_cached(self):
+        """取得失敗時の既定値がキャッシュされず、次回に再取得されるかのテスト"""
+        _read_windows_version.cache_clear()
+        self.addCleanup(_read_windows_version.cache_clear)
+
+        with mock.patch('core.compatibility.winreg.OpenKey', side_effect=OSError("一時的な失敗")):
+            with self.assertLogs('core.compatibility', level='WARNING'):
+                self.assertEqual(SystemCompatibility.get_windows_version(), (10, 0))
+
+        self.assertEqual(_read_windows_version.cache_info().currsize, 0,
+                         "取得失敗時の既定値がキャッシュされています")
+
     # ===========================
     # Windows 11互換性チェックテスト
     # ===========================
@@ -88,12 +118,10 @@ class TestSystemCompatibility(unittest.TestCase):
 
     def test_get_registry_base_path_extension(self):
         """拡張子指定のレジストリパス取得テスト"""
-        extensions = ['.txt', '.py', '.jpg', '.pdf']
-
-        for ext in extensions:
-            path = SystemCompatibility.get_registry_base_path(ext)
-            expected_path = f'Software\\Classes\\{ext}\\shell'
-            self.assertEqual(path, expected_path, f"拡張子 {ext} のパスが正しくありません")
+        for ext, expected_path in _EXPECTED_EXT_PATHS.items():
+            with self.subTest(ext=ext):
+                path = SystemCompatibility.get_registry_base_path(ext)
+                self.assertEqual(path, expected_path, f"拡張子 {ext} のパスが正しくありません")
 
     def test_get_registry_base_path_unknown_type(self):
         """未知のターゲットタイプのデフォルトパステスト"""
@@ -132,6 +160,7 @@ class TestSystemCompatibility(unittest.TestCase):
 
         # 存在しないキーの場合、valuesは空
         self.assertEqual(len(backup['values']), 0, "存在しないキーのvaluesが空ではありません")
+        self.assertEqual(list(SystemCompatibility.iter_backup_values(backup)), [])
 
     def test_backup_registry_key_structure(self):
         """レジストリバックアップの構造テスト"""
@@ -141,16 +170,33 @@ class TestSystemCompatibility(unittest.TestCase):
 
         # 基本構造の確認
         self.assertIsInstance(backup, dict, "バックアップが辞書ではありません")
-        self.assertIsInstance(backup['values'], dict, "valuesが辞書ではありません")
+        self.assertIsInstance(backup['names'], list, "namesがリストではありません")
+        self.assertIsInstance(backup['values'], list, "valuesがリストではありません")
+        self.assertIsInstance(backup['types'], list, "typesがリストではありません")
+        self.assertEqual(len(backup['names']), len(backup['values']), "namesとvaluesの件数が一致しません")
+        self.assertEqual(len(backup['names']), len(backup['types']), "namesとtypesの件数が一致しません")
         self.assertIsInstance(backup['timestamp'], str, "timestampが文字列ではありません")
 
         # タイムスタンプがISO形式か確認
-        from datetime import datetime
         try:
             datetime.fromisoformat(backup['timestamp'])
         except ValueError:
             self.fail("タイムスタンプがISO形式ではありません")
 
+    def test_iter_backup_values_old_format(self):
+        """旧形式（値の辞書）のバックアップが列挙できるかのテスト"""
+        backup = {
+            'path': r"Software\Classes\*\shell\TestKey",
+            'values': {
+                '': {'value': 'テスト', 'type': 1},
+                'Icon': {'value': 'C:\\icon.ico', 'type': 1},
+            },
+            'timestamp': '2025-01-01T00:00:00'
+        }
+
+        self.assertEqual(list(SystemCompatibility.iter_backup_values(backup)),
+                         [('', 'テスト', 1), ('Icon', 'C:\\icon.ico', 1)])
+
 
 class TestSystemCompatibilityEdgeCases(unittest.TestCase):
     """SystemCompatibilityのエッジケーステスト"""
@@ -160,9 +206,10 @@ class TestSystemCompatibilityEdgeCases(unittest.TestCase):
         extensions = ['.txt', '.py', '.jpg', '.png', '.pdf', '.doc', '.zip']
 
         for ext in extensions:
-            path = SystemCompatibility.get_registry_base_path(ext)
-            self.assertTrue(path.startswith('Software\\Classes\\'), f"{ext}のパスが不正です")
-            self.assertIn(ext, path, f"{ext}がパスに含まれていません")
+            with self.subTest(ext=ext):
+                path = SystemCompatibility.get_registry_base_path(ext)
+                self.assertTrue(path.startswith('Software\\Classes\\'), f"{ext}のパスが不正です")
+                self.assertIn(ext, path, f"{ext}がパスに含まれていません")
 
     def test_case_sensitivity_target_type(self):
         """ターゲットタイプの大文字小文字テスト"""
@@ -176,4 +223,16 @@ class TestSystemCompatibilityEdgeCases(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    unittest.main()
+    # unittest-parallel がインストールされていればテストを複数プロセスに分けて実行する
+    # （各テストは共有状態を持たないため分割しても安全）
+    try:
+        from unittest_parallel.main import main as parallel_main
+    except ImportError:
+        unittest.main()
+    else:
+        parallel_main([
+            '-s', os.path.dirname(os.path.abspath(__file__)),
+            '-t', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'),
+            '-p', os.path.basename(__file__),
+            '-j', str(max(1, (os.cpu_count() or 1) - 2)),
+        ])
@@ -4,34 +4,84 @@ Version: 1.0.0
 最終更新: 2025-01-03
 """
 
+import io
 import sys
 import os
 import unittest
+from unittest import mock
 import tempfile
 import json
+import sqlite3
+import stat
+import threading
+import time
+from contextlib import redirect_stdout, suppress
 
 # パス設定
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from config import AppConfig
 from models.database import ContextMenuDatabase
-from core.database import DatabaseManager
+from core.database import DatabaseManager, get_pool
+
+
+# 単体テスト用のインメモリDB
+MEMORY_DB = ':memory:'
+
+
+def _remove_file(path):
+    """一時ファイルを削除する（存在確認の stat を省き、存在しない場合は無視する）"""
+    with suppress(FileNotFoundError):
+        os.unlink(path)
 
 
 class TestContextMenuDatabase(unittest.TestCase):
     """ContextMenuDatabaseクラスのテスト"""
 
+    @classmethod
+    def setUpClass(cls):
+        """初期化済みスキーマのテンプレートDBを1回だけ作成する"""
+        db = ContextMenuDatabase(MEMORY_DB)
+        try:
+            cls._template = sqlite3.connect(':memory:')
+            with DatabaseManager(MEMORY_DB, transaction=False) as conn:
+                conn.backup(cls._template)
+        finally:
+            db.close()
+
+        # JSONファイルの入出力先（テストごとに同じパスを上書きして使う）
+        cls._tmp = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        """テンプレートDBと一時ディレクトリを片付ける"""
+        cls._template.close()
+        cls._tmp.cleanup()
+
     def setUp(self):
-        """テストのセットアップ - 一時データベースを作成"""
-        self.temp_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
-        self.temp_db_path = self.temp_db.name
-        self.temp_db.close()
+        """テストのセットアップ - インメモリデータベースを作成"""
+        # ファイルI/Oを避けるためインメモリDBを使う（プールが閉じられるまで1接続が保持する）
+        self.db_path = MEMORY_DB
 
-        self.db = ContextMenuDatabase(self.temp_db_path)
+        # 使い捨てDBのため fsync を省くPRAGMAでプールを作成しておく
+        get_pool(self.db_path, pragmas=AppConfig.DB_TEST_PRAGMAS)
+
+        # テンプレートからスキーマを一括コピーし、init_database() のDDLを空振りさせる
+        with DatabaseManager(self.db_path, transaction=False) as conn:
+            self._template.backup(conn)
+
+        self.db = ContextMenuDatabase(self.db_path)
 
     def tearDown(self):
-        """テストのクリーンアップ - 一時データベースを削除"""
-        if os.path.exists(self.temp_db_path):
-            os.unlink(self.temp_db_path)
+        """テストのクリーンアップ - データベースを閉じる（インメモリDBも破棄される）"""
+        self.db.close()
+
+    def _write_json(self, data):
+        """インポート用のJSONを一時ディレクトリに書き出し、そのパスを返す"""
+        path = os.path.join(self._tmp.name, 'import.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        return path
 
     # ===========================
     # データベース初期化テスト
@@ -39,7 +89,7 @@ class TestContextMenuDatabase(unittest.TestCase):
 
     def test_init_database_creates_tables(self):
         """データベーステーブルの作成テスト"""
-        with DatabaseManager(self.temp_db_path) as conn:
+        with DatabaseManager(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = [row[0] for row in cursor.fetchall()]
@@ -50,7 +100,7 @@ class TestContextMenuDatabase(unittest.TestCase):
 
     def test_init_database_creates_indexes(self):
         """インデックスの作成テスト"""
-        with DatabaseManager(self.temp_db_path) as conn:
+        with DatabaseManager(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
             indexes = [row[0] for row in cursor.fetchall()]
@@ -58,6 +108,53 @@ class TestContextMenuDatabase(unittest.TestCase):
         # 最低限のインデックスが存在するか確認
         self.assertTrue(len(indexes) > 0, "インデックスが作成されていません")
 
+    def test_init_database_removes_duplicates_on_upgrade(self):
+        """旧データの重複が一意インデックス作成時に除去されるかのテスト"""
+        with DatabaseManager(self.db_path) as conn:
+            conn.execute("DROP INDEX idx_shortcuts_name_target")
+            for command, applied, created_at in (("applied.exe", 1, "2024-01-01 00:00:00"),
+                                                 ("newer.exe", 0, "2024-06-01 00:00:00"),
+                                                 ("old.exe", 0, "2023-01-01 00:00:00")):
+                conn.execute(
+                    "INSERT INTO shortcuts (name, command, target_type, is_system_applied, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    ("適用済み", command, "all_files", applied, created_at)
+                )
+            for command, created_at in (("old.exe", "2023-01-01 00:00:00"),
+                                        ("newer.exe", "2024-06-01 00:00:00")):
+                conn.execute(
+                    "INSERT INTO shortcuts (name, command, target_type, created_at) VALUES (?, ?, ?, ?)",
+                    ("未適用", command, "all_files", created_at)
+                )
+
+        with redirect_stdout(io.StringIO()) as out:
+            self.db.init_database()
+
+        commands = {s.name: s.command for s in self.db.get_all_shortcuts()}
+        self.assertEqual(commands, {"適用済み": "applied.exe", "未適用": "newer.exe"},
+                         "適用済み・最新の行が残っていません")
+        self.assertIn("3件削除", out.getvalue())
+        self.assertIsNone(self.db.add_shortcut("未適用", "code.exe", "all_files"),
+                          "一意制約が機能していません")
+
+        with DatabaseManager(self.db_path, transaction=False) as conn:
+            audited = [row['shortcut_name'] for row in conn.execute(
+                "SELECT shortcut_name FROM audit_log WHERE action = 'DELETE' ORDER BY id")]
+        self.assertEqual(sorted(audited), sorted(["適用済み", "適用済み", "未適用"]))
+
+    def test_database_manager_rollback_on_error(self):
+        """例外発生時にブロック内の書き込みがロールバックされるかのテスト"""
+        with self.assertRaises(RuntimeError):
+            with DatabaseManager(self.db_path) as conn:
+                conn.execute(
+                    "INSERT INTO shortcuts (name, command, target_type) VALUES (?, ?, ?)",
+                    ("ロールバック", "notepad.exe", "all_files")
+                )
+                raise RuntimeError("テスト用の例外")
+
+        shortcuts = self.db.get_all_shortcuts()
+        self.assertEqual(len(shortcuts), 0, "ロールバックされていません")
+
     # ===========================
     # ショートカット追加テスト
     # ===========================
@@ -87,7 +184,7 @@ class TestContextMenuDatabase(unittest.TestCase):
 
         # 取得して確認
         shortcuts = self.db.get_all_shortcuts()
-        self.assertEqual(shortcuts[0]['icon_path'], "C:\\icon.ico")
+        self.assertEqual(shortcuts[0].icon_path, "C:\\icon.ico")
 
     def test_add_multiple_shortcuts(self):
         """複数ショートカット追加のテスト"""
@@ -105,6 +202,25 @@ class TestContextMenuDatabase(unittest.TestCase):
         self.assertEqual(len(ids), 3, "すべてのショートカットが追加されていません")
         self.assertEqual(len(set(ids)), 3, "ショートカットIDが重複しています")
 
+    def test_add_shortcuts_bulk(self):
+        """ショートカット一括追加のテスト（複数の VALUES 句に分割される件数）"""
+        rows = [(f"一括{i}", "notepad.exe", "all_files", "") for i in range(300)]
+
+        added = self.db.add_shortcuts(rows)
+
+        self.assertEqual(added, 300)
+        self.assertEqual(len(self.db.get_all_shortcuts()), 300)
+
+    def test_add_shortcuts_bulk_rolls_back_on_duplicate(self):
+        """一括追加で重複があった場合は1件も追加されないことのテスト"""
+        rows = [("重複", "notepad.exe", "all_files", ""),
+                ("重複", "calc.exe", "all_files", "")]
+
+        added = self.db.add_shortcuts(rows)
+
+        self.assertEqual(added, 0)
+        self.assertEqual(len(self.db.get_all_shortcuts()), 0)
+
     # ===========================
     # ショートカット取得テスト
     # ===========================
@@ -122,6 +238,18 @@ class TestContextMenuDatabase(unittest.TestCase):
         shortcuts = self.db.get_all_shortcuts()
         self.assertEqual(len(shortcuts), 2, "ショートカット数が一致しません")
 
+    def test_get_all_shortcuts_for_display_truncates_command(self):
+        """表示用取得でコマンドが50文字に切り詰められるかのテスト"""
+        long_command = "notepad.exe " + "a" * 60
+        self.db.add_shortcut("長いコマンド", long_command, "all_files")
+        self.db.add_shortcut("短いコマンド", "notepad.exe", "all_files")
+
+        rows = {s.name: s for s in self.db.get_all_shortcuts_for_display()}
+
+        self.assertEqual(rows["長いコマンド"].command_short, long_command[:50] + '...')
+        self.assertEqual(rows["長いコマンド"].command, long_command)
+        self.assertEqual(rows["短いコマンド"].command_short, "notepad.exe")
+
     def test_get_all_shortcuts_order(self):
         """ショートカット取得順序のテスト（created_at DESC）"""
         self.db.add_shortcut("最初", "notepad.exe", "all_files")
@@ -130,8 +258,8 @@ class TestContextMenuDatabase(unittest.TestCase):
 
         shortcuts = self.db.get_all_shortcuts()
         # 最新のものが最初に来る
-        self.assertEqual(shortcuts[0]['name'], "最後")
-        self.assertEqual(shortcuts[2]['name'], "最初")
+        self.assertEqual(shortcuts[0].name, "最後")
+        self.assertEqual(shortcuts[2].name, "最初")
 
     # ===========================
     # ショートカット削除テスト
@@ -164,8 +292,8 @@ class TestContextMenuDatabase(unittest.TestCase):
         self.db.update_system_applied(shortcut_id, True)
 
         shortcuts = self.db.get_all_shortcuts()
-        self.assertEqual(shortcuts[0]['is_system_applied'], 1)
-        self.assertEqual(shortcuts[0]['apply_count'], 1)
+        self.assertEqual(shortcuts[0].is_system_applied, 1)
+        self.assertEqual(shortcuts[0].apply_count, 1)
 
     def test_update_system_applied_multiple_times(self):
         """複数回の適用状態更新テスト"""
@@ -176,7 +304,7 @@ class TestContextMenuDatabase(unittest.TestCase):
             self.db.update_system_applied(shortcut_id, True)
 
         shortcuts = self.db.get_all_shortcuts()
-        self.assertEqual(shortcuts[0]['apply_count'], 3, "適用回数が正しくカウントされていません")
+        self.assertEqual(shortcuts[0].apply_count, 3, "適用回数が正しくカウントされていません")
 
     # ===========================
     # 有効/無効切り替えテスト
@@ -188,17 +316,17 @@ class TestContextMenuDatabase(unittest.TestCase):
 
         # デフォルトは有効(1)
         shortcuts = self.db.get_all_shortcuts()
-        self.assertEqual(shortcuts[0]['is_active'], 1)
+        self.assertEqual(shortcuts[0].is_active, 1)
 
         # 無効に切り替え
         self.db.toggle_active(shortcut_id)
         shortcuts = self.db.get_all_shortcuts()
-        self.assertEqual(shortcuts[0]['is_active'], 0)
+        self.assertEqual(shortcuts[0].is_active, 0)
 
         # 再び有効に切り替え
         self.db.toggle_active(shortcut_id)
         shortcuts = self.db.get_all_shortcuts()
-        self.assertEqual(shortcuts[0]['is_active'], 1)
+        self.assertEqual(shortcuts[0].is_active, 1)
 
     # ===========================
     # レジストリバックアップテスト
@@ -208,15 +336,15 @@ class TestContextMenuDatabase(unittest.TestCase):
         """レジストリバックアップ保存テスト"""
         backup_data = {
             'path': r'Software\Classes\*\shell\TestShortcut',
-            'values': {
-                'Icon': {'value': 'C:\\icon.ico', 'type': 1}
-            }
+            'names': ['Icon'],
+            'values': ['C:\\icon.ico'],
+            'types': [1]
         }
 
         self.db.save_registry_backup("テストショートカット", backup_data)
 
         # バックアップが保存されたか確認
-        with DatabaseManager(self.temp_db_path) as conn:
+        with DatabaseManager(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM registry_backups WHERE shortcut_name = ?",
                          ("テストショートカット",))
@@ -234,8 +362,8 @@ class TestContextMenuDatabase(unittest.TestCase):
 
         logs = self.db.get_audit_log()
         self.assertTrue(len(logs) > 0, "監査ログが記録されていません")
-        self.assertEqual(logs[0]['action'], 'ADD')
-        self.assertEqual(logs[0]['shortcut_name'], "ログテスト")
+        self.assertEqual(logs[0].action, 'ADD')
+        self.assertEqual(logs[0].shortcut_name, "ログテスト")
 
     def test_audit_log_on_delete(self):
         """ショートカット削除時の監査ログテスト"""
@@ -244,7 +372,74 @@ class TestContextMenuDatabase(unittest.TestCase):
 
         logs = self.db.get_audit_log()
         # 最新のログが削除ログ
-        self.assertEqual(logs[0]['action'], 'DELETE')
+        self.assertEqual(logs[0].action, 'DELETE')
+
+    def test_audit_log_flushed_on_close(self):
+        """close時にキュー内の監査ログがファイルに書き込まれるかのテスト"""
+        # 再オープン後まで残るかを確認するため、このテストのみファイルDBを使う
+        db_path = tempfile.NamedTemporaryFile(suffix='.db', delete=False).name
+        db = ContextMenuDatabase(db_path)
+        try:
+            db.add_shortcut("終了時ログ", "notepad.exe", "all_files")
+            db.close()
+
+            db = ContextMenuDatabase(db_path)
+            logs = db.get_audit_log()
+            self.assertEqual(len(logs), 1, "監査ログが書き込まれていません")
+            self.assertEqual(logs[0].shortcut_name, "終了時ログ")
+        finally:
+            db.close()
+            _remove_file(db_path)
+
+    def test_bulk_writes_audit_log_on_exit(self):
+        """bulk() ブロック内の監査ログが終了時にまとめて書き込まれるかのテスト"""
+        with self.db.bulk():
+            for i in range(AppConfig.AUDIT_FLUSH_THRESHOLD + 1):
+                self.db.add_shortcut(f"まとめて{i}", "notepad.exe", "all_files")
+
+        # get_audit_log() は書き込み前にキューを処理するため、テーブルを直接確認する
+        with DatabaseManager(self.db_path, transaction=False) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+        self.assertEqual(count, AppConfig.AUDIT_FLUSH_THRESHOLD + 1)
+
+    def test_concurrent_audit_flush_keeps_queue_order(self):
+        """別スレッドの書き込みが遅れても監査ログがキューの順序で記録されるかのテスト"""
+        entered = threading.Event()
+
+        class SlowFirstManager(DatabaseManager):
+            """最初の書き込みだけ接続取得前に待機する"""
+            __slots__ = ()
+            first = [True]
+
+            def __enter__(self):
+                if self.first[0]:
+                    self.first[0] = False
+                    entered.set()
+                    time.sleep(0.2)
+                return super().__enter__()
+
+        self.db._log_audit('ADD', "先")
+        with mock.patch('models.database.DatabaseManager', SlowFirstManager):
+            flusher = threading.Thread(target=self.db._flush_audit)
+            flusher.start()
+            entered.wait(5)
+            self.db._log_audit('ADD', "後")
+            self.db._flush_audit()
+            flusher.join()
+
+        with DatabaseManager(self.db_path, transaction=False) as conn:
+            logged = [row['shortcut_name'] for row in conn.execute(
+                "SELECT shortcut_name FROM audit_log ORDER BY id")]
+        self.assertEqual(logged, ["先", "後"])
+
+    def test_get_audit_log_null_fields(self):
+        """監査ログのNULL列が空文字で返されるかのテスト"""
+        shortcut_id = self.db.add_shortcut("NULLテスト", "notepad.exe", "all_files")
+        self.db.delete_shortcut(shortcut_id)
+
+        delete_logs = [log for log in self.db.get_audit_log() if log.action == 'DELETE']
+        self.assertEqual(len(delete_logs), 1)
+        self.assertEqual(delete_logs[0].details, '', "NULLの詳細が空文字になっていません")
 
     def test_get_audit_log_limit(self):
         """監査ログ取得件数制限のテスト"""
@@ -256,6 +451,19 @@ class TestContextMenuDatabase(unittest.TestCase):
         logs = self.db.get_audit_log(limit=3)
         self.assertEqual(len(logs), 3, "取得件数制限が機能していません")
 
+    def test_get_audit_log_offset(self):
+        """監査ログのページ取得テスト"""
+        for i in range(5):
+            self.db.add_shortcut(f"ページ{i}", "notepad.exe", "all_files")
+
+        first_page = self.db.get_audit_log(limit=3)
+        second_page = self.db.get_audit_log(limit=3, offset=3)
+
+        self.assertEqual(len(first_page), 3)
+        self.assertEqual(len(second_page), 2)
+        ids = [log.id for log in first_page + second_page]
+        self.assertEqual(len(set(ids)), 5, "ページ間で監査ログが重複しています")
+
     # ===========================
     # JSONエクスポート/インポートテスト
     # ===========================
@@ -265,25 +473,56 @@ class TestContextMenuDatabase(unittest.TestCase):
         self.db.add_shortcut("エクスポート1", "notepad.exe", "all_files")
         self.db.add_shortcut("エクスポート2", "code.exe", "folder")
 
-        export_path = tempfile.NamedTemporaryFile(suffix='.json', delete=False).name
+        export_path = os.path.join(self._tmp.name, 'export.json')
+        _remove_file(export_path)
 
-        try:
-            self.db.export_to_json(export_path)
+        self.db.export_to_json(export_path)
 
-            # ファイルが作成されたか確認
-            self.assertTrue(os.path.exists(export_path), "エクスポートファイルが作成されていません")
+        # ファイルが作成されたか確認
+        self.assertTrue(os.path.exists(export_path), "エクスポートファイルが作成されていません")
 
-            # 内容を確認
-            with open(export_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        # 内容を確認
+        with open(export_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
-            self.assertIn('shortcuts', data)
-            self.assertEqual(len(data['shortcuts']), 2)
-            self.assertEqual(data['version'], '2.1')
+        self.assertIn('shortcuts', data)
+        self.assertEqual(len(data['shortcuts']), 2)
+        self.assertEqual(data['version'], '2.1')
 
+    @unittest.skipIf(os.name == 'nt', "Windowsでは権限ビットを確認できない")
+    def test_export_to_json_file_mode(self):
+        """エクスポートファイルの権限が umask・既存ファイルの権限に従うかのテスト"""
+        export_path = os.path.join(self._tmp.name, 'export_mode.json')
+        _remove_file(export_path)
+
+        umask = os.umask(0o022)
+        try:
+            self.db.export_to_json(export_path)
+            self.assertEqual(stat.S_IMODE(os.stat(export_path).st_mode), 0o644)
+
+            os.chmod(export_path, 0o640)
+            self.db.export_to_json(export_path)
+            self.assertEqual(stat.S_IMODE(os.stat(export_path).st_mode), 0o640)
         finally:
-            if os.path.exists(export_path):
-                os.unlink(export_path)
+            os.umask(umask)
+
+    def test_export_to_json_failure_keeps_previous_file(self):
+        """エクスポート失敗時に既存のファイルが残り、一時ファイルが削除されるかのテスト"""
+        self.db.add_shortcut("エクスポート", "notepad.exe", "all_files")
+        export_dir = os.path.join(self._tmp.name, 'export_failure')
+        os.makedirs(export_dir, exist_ok=True)
+        export_path = os.path.join(export_dir, 'export.json')
+        with open(export_path, 'w', encoding='utf-8') as f:
+            f.write('{"previous": true}')
+
+        with mock.patch.object(ContextMenuDatabase, '_SQL_GET_ACTIVE_FOR_EXPORT',
+                               'SELECT * FROM missing_table'):
+            with self.assertRaises(Exception):
+                self.db.export_to_json(export_path)
+
+        with open(export_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"previous": True})
+        self.assertEqual(os.listdir(export_dir), ['export.json'], "一時ファイルが残っています")
 
     def test_import_from_json(self):
         """JSONインポートのテスト"""
@@ -305,24 +544,17 @@ class TestContextMenuDatabase(unittest.TestCase):
             ]
         }
 
-        import_path = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8')
-        json.dump(import_data, import_path, ensure_ascii=False)
-        import_path.close()
+        import_path = self._write_json(import_data)
 
-        try:
-            success_count, skip_count, errors = self.db.import_from_json(import_path.name)
-
-            self.assertEqual(success_count, 2, "インポート成功数が一致しません")
-            self.assertEqual(skip_count, 0, "スキップ数が一致しません")
-            self.assertEqual(len(errors), 0, "エラーが発生しました")
+        success_count, skip_count, errors = self.db.import_from_json(import_path)
 
-            # インポートされたか確認
-            shortcuts = self.db.get_all_shortcuts()
-            self.assertEqual(len(shortcuts), 2)
+        self.assertEqual(success_count, 2, "インポート成功数が一致しません")
+        self.assertEqual(skip_count, 0, "スキップ数が一致しません")
+        self.assertEqual(len(errors), 0, "エラーが発生しました")
 
-        finally:
-            if os.path.exists(import_path.name):
-                os.unlink(import_path.name)
+        # インポートされたか確認
+        shortcuts = self.db.get_all_shortcuts()
+        self.assertEqual(len(shortcuts), 2)
 
     def test_import_duplicate_shortcuts(self):
         """重複ショートカットのインポートテスト"""
@@ -340,18 +572,73 @@ class TestContextMenuDatabase(unittest.TestCase):
             ]
         }
 
-        import_path = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8')
-        json.dump(import_data, import_path, ensure_ascii=False)
-        import_path.close()
+        import_path = self._write_json(import_data)
 
-        try:
-            success_count, skip_count, errors = self.db.import_from_json(import_path.name)
+        success_count, skip_count, errors = self.db.import_from_json(import_path)
 
-            self.assertEqual(skip_count, 1, "重複がスキップされていません")
+        self.assertEqual(skip_count, 1, "重複がスキップされていません")
 
-        finally:
-            if os.path.exists(import_path.name):
-                os.unlink(import_path.name)
+    def test_import_case_variants_match_add_shortcut(self):
+        """大文字小文字だけが異なる名前の扱いがインポートと add_shortcut で一致するかのテスト"""
+        self.assertIsNotNone(self.db.add_shortcut("Foo", "notepad.exe", "all_files"))
+        self.assertIsNotNone(self.db.add_shortcut("foo", "notepad.exe", "all_files"))
+
+        import_path = self._write_json({
+            "shortcuts": [
+                {"name": "Bar", "command": "notepad.exe", "target_type": "all_files"},
+                {"name": "bar", "command": "notepad.exe", "target_type": "all_files"}
+            ]
+        })
+
+        success_count, skip_count, errors = self.db.import_from_json(import_path)
+
+        self.assertEqual((success_count, skip_count), (2, 0), errors)
+
+    def test_import_from_json_bulk(self):
+        """一括モードでのJSONインポートのテスト"""
+        self.db.add_shortcut("既存", "notepad.exe", "all_files")
+
+        import_data = {
+            "shortcuts": [
+                {"name": "既存", "command": "notepad.exe", "target_type": "all_files", "icon_path": ""},
+                {"name": "一括1", "command": "notepad.exe %1", "target_type": "all_files", "icon_path": ""},
+                {"name": "一括2", "command": "code.exe .", "target_type": "folder", "icon_path": ""}
+            ]
+        }
+
+        import_path = self._write_json(import_data)
+
+        success_count, skip_count, errors = self.db.import_from_json(import_path, bulk=True)
+
+        self.assertEqual(success_count, 2, "インポート成功数が一致しません")
+        self.assertEqual(skip_count, 1, "重複がスキップされていません")
+        self.assertEqual(len(errors), 0, "エラーが発生しました")
+        self.assertEqual(len(self.db.get_all_shortcuts()), 3)
+
+        # 追加件数分の監査ログが記録される
+        actions = [log.action for log in self.db.get_audit_log()]
+        self.assertEqual(actions.count('ADD'), 3)
+
+    def test_import_from_json_bulk_audits_only_new_rows(self):
+        """一括インポートで追加された行のみ監査ログに記録されるかのテスト"""
+        self.db.add_shortcut("既存", "notepad.exe", "all_files")
+        removed_id = self.db.add_shortcut("削除済み", "notepad.exe", "all_files")
+        self.db.delete_shortcut(removed_id)
+
+        import_data = {
+            "shortcuts": [
+                {"name": "既存", "command": "notepad.exe", "target_type": "all_files", "icon_path": ""},
+                {"name": "新規", "command": "notepad.exe %1", "target_type": "all_files", "icon_path": ""}
+            ]
+        }
+
+        import_path = self._write_json(import_data)
+
+        success_count, skip_count, errors = self.db.import_from_json(import_path)
+
+        self.assertEqual((success_count, skip_count), (1, 1))
+        added = [log.shortcut_name for log in self.db.get_audit_log() if log.action == 'ADD']
+        self.assertEqual(sorted(added), sorted(["既存", "削除済み", "新規"]))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,73 @@
+"""
+Context Menu Manager - コンテキストメニュー管理モジュールのユニットテスト
+Version: 1.0.0
+最終更新: 2025-01-03
+"""
+
+import sys
+import os
+import importlib
+import unittest
+from unittest import mock
+from ctypes import wintypes
+
+# パス設定
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+# CreateToolhelp32Snapshot が失敗時に返す値
+_INVALID_HANDLE = wintypes.HANDLE(-1).value
+
+
+def _import_menu_module():
+    """
+    winreg と ctypes.windll を差し替えて managers.menu を読み込む
+
+    Windows専用APIを呼び出す経路も、どのOSでも実行できるようにする
+    """
+    modules = {'winreg': mock.MagicMock()}
+    with mock.patch.dict(sys.modules, modules), \
+            mock.patch('ctypes.windll', mock.MagicMock(), create=True):
+        for name in ('managers.menu', 'core.compatibility'):
+            sys.modules.pop(name, None)
+        return importlib.import_module('managers.menu')
+
+
+class TestProcessCheck(unittest.TestCase):
+    """Toolhelp32 によるプロセス確認とエクスプローラー再起動のテスト"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.menu = _import_menu_module()
+
+    def test_is_process_running_invalid_snapshot(self):
+        """スナップショット取得に失敗した場合にFalseを返すかのテスト"""
+        with mock.patch.object(self.menu, '_CreateToolhelp32Snapshot',
+                               return_value=_INVALID_HANDLE):
+            self.assertFalse(self.menu._is_process_running('explorer.exe'))
+
+    def test_is_process_running_not_found(self):
+        """プロセスが見つからない場合にFalseを返し、ハンドルを閉じるかのテスト"""
+        with mock.patch.object(self.menu, '_CreateToolhelp32Snapshot', return_value=1), \
+                mock.patch.object(self.menu, '_Process32First', return_value=False), \
+                mock.patch.object(self.menu, '_CloseHandle') as close_handle:
+            self.assertFalse(self.menu._is_process_running('explorer.exe'))
+
+        close_handle.assert_called_once_with(1)
+
+    def test_restart_explorer_starts_explorer(self):
+        """終了確認後にエクスプローラーが起動されるかのテスト"""
+        manager = self.menu.ContextMenuManager()
+        with mock.patch.object(self.menu.subprocess, 'run') as run, \
+                mock.patch.object(self.menu.subprocess, 'Popen') as popen, \
+                mock.patch.object(self.menu, '_CreateToolhelp32Snapshot',
+                                  return_value=_INVALID_HANDLE):
+            success, message = manager.restart_explorer()
+
+        self.assertTrue(success, message)
+        run.assert_called_once()
+        popen.assert_called_once_with('explorer.exe')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,9 @@ Version: 1.0.0
 
 import sys
 import os
+import tempfile
 import unittest
+from unittest import mock
 
 # パス設定
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -74,6 +76,25 @@ class TestSecurityValidator(unittest.TestCase):
         valid, msg = self.validator.validate_command("reg delete HKLM\\Software")
         self.assertFalse(valid, "レジストリ削除コマンドが許可されました")
 
+    def test_validate_command_dangerous_patterns_combined(self):
+        """結合した正規表現ですべての危険パターンが検出されるかのテスト"""
+        dangerous_commands = [
+            "DEL C:\\temp",
+            "cmd /c restart",
+            "taskkill /F /IM notepad.exe",
+            "powershell -Command Remove-Item C:\\temp",
+            "net user guest /delete",
+            "wmic useraccount delete",
+            "bcdedit /set bootmenupolicy legacy",
+            "diskpart /s script.txt",
+            "cipher /w:C:\\",
+        ]
+        for cmd in dangerous_commands:
+            with self.subTest(cmd=cmd):
+                valid, msg = self.validator.validate_command(cmd)
+                self.assertFalse(valid, f"危険なコマンドが許可されました: {cmd}")
+                self.assertIn("危険なコマンドパターン", msg)
+
     def test_validate_command_network_path(self):
         """ネットワークパスのテスト"""
         valid, msg = self.validator.validate_command("\\\\server\\share\\file.exe")
@@ -96,6 +117,33 @@ class TestSecurityValidator(unittest.TestCase):
         valid, msg = self.validator.validate_command("malware.exe")
         self.assertFalse(valid, "ホワイトリストにない実行ファイルが許可されました")
 
+    def test_validate_command_stray_quote(self):
+        """対になっていない引用符でホワイトリストを回避できないかのテスト"""
+        for cmd in ('notepad.exe"&calc', '"notepad.exe"&calc', '"notepad.exe &calc'):
+            with self.subTest(cmd=cmd):
+                valid, msg = self.validator.validate_command(cmd)
+                self.assertFalse(valid, f"引用符を含むコマンドが許可されました: {cmd}")
+
+    def test_validate_command_alternate_data_stream(self):
+        """代替データストリーム名でホワイトリストを回避できないかのテスト"""
+        for cmd in ("C:\\nonexistent\\evil.txt:notepad.exe", "evil.txt:notepad.exe"):
+            with self.subTest(cmd=cmd):
+                valid, msg = self.validator.validate_command(cmd)
+                self.assertFalse(valid, f"代替データストリームが許可されました: {cmd}")
+
+    def test_validate_command_drive_relative_executable(self):
+        """ドライブ指定のみの相対パス (C:notepad.exe) はファイル名で判定されるかのテスト"""
+        valid, msg = self.validator.validate_command("C:notepad.exe test.txt")
+        self.assertTrue(valid, f"ドライブ指定付きの実行ファイルが拒否されました: {msg}")
+
+        valid, msg = self.validator.validate_command("C:malware.exe")
+        self.assertFalse(valid, "ホワイトリストにない実行ファイルが許可されました")
+
+    def test_validate_command_quoted_executable(self):
+        """引用符で囲まれた実行ファイルのテスト"""
+        valid, msg = self.validator.validate_command('"notepad.exe" "C:\\my file.txt"')
+        self.assertTrue(valid, f"引用符で囲まれた実行ファイルが拒否されました: {msg}")
+
     # ===========================
     # 名前検証テスト
     # ===========================
@@ -129,6 +177,13 @@ class TestSecurityValidator(unittest.TestCase):
             valid, msg = self.validator.validate_name(name)
             self.assertFalse(valid, f"禁止文字 '{char}' を含む名前が許可されました")
 
+    def test_validate_name_control_characters(self):
+        """制御文字を含む名前のテスト"""
+        for char in ['\x00', '\t', '\n', '\x1f']:
+            with self.subTest(char=repr(char)):
+                valid, msg = self.validator.validate_name(f"テスト{char}名前")
+                self.assertFalse(valid, f"制御文字 {char!r} を含む名前が許可されました")
+
     def test_validate_name_reserved_words(self):
         """予約語のテスト"""
         reserved_names = ['CON', 'PRN', 'AUX', 'NUL', 'COM1', 'LPT1']
@@ -158,7 +213,6 @@ class TestSecurityValidator(unittest.TestCase):
     def test_validate_icon_path_invalid_extension(self):
         """サポートされていない拡張子のテスト"""
         # 一時ファイルを作成してテスト
-        import tempfile
         with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as tmp:
             tmp_path = tmp.name
 
@@ -168,6 +222,15 @@ class TestSecurityValidator(unittest.TestCase):
         finally:
             os.unlink(tmp_path)
 
+    def test_validate_icon_path_extension_checked_before_stat(self):
+        """拡張子が不正な場合はファイル情報を取得せずに拒否されるかのテスト"""
+        with mock.patch('core.security.os.stat') as stat:
+            valid, msg = self.validator.validate_icon_path("C:\\nonexistent\\file.txt")
+
+        self.assertFalse(valid)
+        self.assertIn("サポートされていないファイル形式", msg)
+        stat.assert_not_called()
+
     # ===========================
     # JSONインポートのサニタイズテスト
     # ===========================
@@ -231,6 +294,103 @@ class TestSecurityValidator(unittest.TestCase):
         self.assertTrue(is_valid, "部分的に有効なデータが完全に拒否されました")
         self.assertEqual(len(sanitized['shortcuts']), 1, "不正な項目がフィルタリングされていません")
 
+    def test_sanitize_json_import_duplicate_items(self):
+        """重複したショートカット項目を含むテスト"""
+        data = {
+            "shortcuts": [
+                {"name": "重複", "command": "notepad.exe", "target_type": "all_files"},
+                {"name": "重複", "command": "code.exe", "target_type": "all_files"},
+                {"name": "重複", "command": "notepad.exe", "target_type": "folder"}
+            ]
+        }
+
+        is_valid, message, sanitized = self.validator.sanitize_json_import(data)
+        self.assertTrue(is_valid)
+        self.assertEqual(len(sanitized['shortcuts']), 2, "重複項目がフィルタリングされていません")
+        self.assertEqual(sanitized['shortcuts'][0]['command'], "notepad.exe", "最初の項目が保持されていません")
+
+    def test_sanitize_json_import_duplicate_is_case_sensitive(self):
+        """大文字小文字だけが異なる名前は重複とみなさないかのテスト（DBの一意制約と同じ規則）"""
+        data = {
+            "shortcuts": [
+                {"name": "Foo", "command": "notepad.exe", "target_type": "all_files"},
+                {"name": "foo", "command": "notepad.exe", "target_type": "all_files"}
+            ]
+        }
+
+        is_valid, message, sanitized = self.validator.sanitize_json_import(data)
+        self.assertTrue(is_valid)
+        self.assertEqual([s['name'] for s in sanitized['shortcuts']], ["Foo", "foo"])
+
+    def test_sanitize_json_import_null_name(self):
+        """名前がnullの項目が個別のエラーになり、他の項目は取り込まれるかのテスト"""
+        data = {
+            "shortcuts": [
+                {"name": None, "command": "notepad.exe", "target_type": "all_files"},
+                {"name": "正常", "command": "notepad.exe", "target_type": "all_files"}
+            ]
+        }
+
+        is_valid, message, sanitized = self.validator.sanitize_json_import(data)
+        self.assertTrue(is_valid)
+        self.assertEqual([s['name'] for s in sanitized['shortcuts']], ["正常"])
+        self.assertIn("項目1: エラー: 名前が空です", message)
+
+    def test_sanitize_json_import_non_string_target_type(self):
+        """ターゲットタイプが文字列でない項目が個別のエラーになるかのテスト"""
+        data = {
+            "shortcuts": [
+                {"name": "リスト", "command": "notepad.exe", "target_type": ["all_files"]},
+                {"name": "数値", "command": "notepad.exe", "target_type": 1},
+                {"name": "正常", "command": "notepad.exe", "target_type": "all_files"}
+            ]
+        }
+
+        is_valid, message, sanitized = self.validator.sanitize_json_import(data)
+        self.assertTrue(is_valid)
+        self.assertEqual([s['name'] for s in sanitized['shortcuts']], ["正常"])
+        self.assertIn("項目1: 不正なターゲットタイプ", message)
+        self.assertIn("項目2: 不正なターゲットタイプ", message)
+
+    def test_sanitize_json_import_checks_each_icon_path_once(self):
+        """同じアイコンパスの検証が1回にまとめられるかのテスト"""
+        icon = "C:\\nonexistent_icon.ico"
+        data = {
+            "shortcuts": [
+                {"name": f"アイコン{i}", "command": "notepad.exe", "target_type": "all_files",
+                 "icon_path": icon}
+                for i in range(5)
+            ]
+        }
+
+        with mock.patch.object(SecurityValidator, 'validate_icon_path',
+                               wraps=SecurityValidator.validate_icon_path) as validate:
+            is_valid, message, sanitized = self.validator.sanitize_json_import(data)
+
+        self.assertTrue(is_valid)
+        validate.assert_called_once_with(icon)
+        self.assertEqual(len(sanitized['shortcuts']), 5)
+        self.assertTrue(all(s['icon_path'] == '' for s in sanitized['shortcuts']),
+                        "無効なアイコンパスが空になっていません")
+
+    def test_sanitize_json_import_name_errors_match_validate_name(self):
+        """一括判定後も名前のエラーメッセージが validate_name() と一致するかのテスト"""
+        names = ["正常", "", "   ", "a" * 101, "test<1>", "tab\tname", "con", "正常2"]
+        data = {
+            "shortcuts": [
+                {"name": name, "command": "notepad.exe", "target_type": "all_files"}
+                for name in names
+            ]
+        }
+
+        is_valid, message, sanitized = self.validator.sanitize_json_import(data)
+
+        self.assertTrue(is_valid)
+        self.assertEqual([s['name'] for s in sanitized['shortcuts']], ["正常", "正常2"])
+        expected = [f"項目{i+1}: {self.validator.validate_name(name)[1]}"
+                    for i, name in enumerate(names) if name not in ("正常", "正常2")]
+        self.assertEqual(message.split("\n")[1:], expected[:5])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,8 @@ Version: 2.1.1 (修正版)
 最終更新: 2025-01-03
 """
 
+import re
+
 # ターゲットタイプの定義
 TARGET_TYPES = (
     'all_files',     # すべてのファイル
@@ -17,7 +19,7 @@ TARGET_TYPES = (
 )
 
 # 安全な実行ファイルのホワイトリスト
-SAFE_EXECUTABLES = {
+SAFE_EXECUTABLES = frozenset({
     'notepad.exe',    # メモ帳
     'code.exe',       # VS Code
     'cmd.exe',        # コマンドプロンプト
@@ -30,7 +32,7 @@ SAFE_EXECUTABLES = {
     'pythonw.exe',    # Python (GUI)
     'git.exe',        # Git
     'vim.exe'         # Vim
-}
+})
 
 # 危険なコマンドパターン（正規表現）
 DANGEROUS_PATTERNS = [
@@ -46,15 +48,27 @@ DANGEROUS_PATTERNS = [
     r'cipher\s+/w',                         # データ消去
 ]
 
+# 危険なパターンを1つの正規表現にまとめて事前コンパイルしたもの（1回の走査で判定する）
+DANGEROUS_PATTERNS_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in DANGEROUS_PATTERNS),
+    re.IGNORECASE
+)
+
+# 名前に使用できない文字
+INVALID_NAME_CHARS = '<>:"/\\|?*'
+
+# 使用できない文字と制御文字を1回の走査で検出する文字クラス
+INVALID_NAME_CHARS_RE = re.compile(f"[{re.escape(INVALID_NAME_CHARS)}\\x00-\\x1f]")
+
 # Windows予約語
-RESERVED_NAMES = [
+RESERVED_NAMES = frozenset({
     'CON', 'PRN', 'AUX', 'NUL', 
     'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
     'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-]
+})
 
 # 対応アイコンファイル拡張子
-ICON_EXTENSIONS = ['.ico', '.exe', '.dll']
+ICON_EXTENSIONS = frozenset({'.ico', '.exe', '.dll'})
 
 
 # ✅ チェック完了: utils.py